@@ -0,0 +1,39 @@
+# backend\src\applications\info_errores\router.py
+
+from fastapi import APIRouter, Depends, Query, Request
+from sqlmodel import select
+
+from core.deadline import request_timeout
+from core.export import ExportFormat, export_response
+from core.manager_db_sync import read_sessionmaker
+from core.security import require_roles
+from .models import Errores
+
+
+info_errores_router = APIRouter(
+    prefix="/errores",
+    tags=["errores"],
+    dependencies=[Depends(require_roles("admin"))],
+)
+
+
+@info_errores_router.get("/export", dependencies=[Depends(request_timeout(1800))])
+async def export_errores(request: Request, formato: ExportFormat = Query("csv")):
+    """
+    Descarga `errores_logs` en csv (streaming) o xlsx, del más reciente al más
+    antiguo, leído con un cursor de servidor en el pool de hilos de exportación.
+    """
+    statement = select(
+        Errores.message_id,
+        Errores.location,
+        Errores.buzon,
+        Errores.error,
+        Errores.created_at,
+    ).order_by(Errores.created_at.desc())
+    return await export_response(
+        read_sessionmaker(request),
+        statement,
+        ["message_id", "location", "buzon", "error", "created_at"],
+        formato,
+        "errores_logs",
+    )
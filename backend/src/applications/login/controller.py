@@ -2,18 +2,19 @@
 
 
 from sqlmodel import Session, select
-from fastapi import HTTPException, Response, status, Depends
+from fastapi import HTTPException, Request, Response, status, Depends
 from fastapi.responses import JSONResponse
 from http import HTTPStatus
 from logging import Logger
 from typing import Optional
 
 
-from core.settings import settings
+from core.executor import run_in_db_thread
+from core.lazy_session import call_and_release
 from core.utils import normalize_text
 from core.session_manager import SessionManager
-from core.token_utils import create_token
-from werkzeug.security import generate_password_hash, check_password_hash
+from core.token_utils import create_token, get_uuid_and_exp_from_token, set_auth_cookie
+from core.hashing import password_hasher
 from core.models.users import Users
 
 
@@ -24,7 +25,11 @@ class LoginService:
         self.logger = logger
         self.session_manager = SessionManager(session, logger)
 
-    def login(self, response: Response, username: str, password: str):
+    async def login(self, response: Response, username: str, password: str):
+        """
+        Los pasos de BD van a `db_executor`; el hash se espera en el event loop,
+        así un pico de logins no retiene hilos de BD durante el hash.
+        """
         if not username or not password:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -33,33 +38,40 @@ class LoginService:
 
         username_normalizado = normalize_text(username).upper()
 
-        user = self.get_user(username_normalizado)
+        # El hash de la contraseña es lento: no retener la conexión mientras tanto.
+        user = await run_in_db_thread(call_and_release, self.session, self.get_user, username_normalizado)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Usuario no encontrado"
             )
 
-        if not user.hash_pwd or not self.authenticate_user(user.hash_pwd, password):
+        if not user.hash_pwd or not await self.authenticate_user(user.hash_pwd, password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Contraseña incorrecta"
             )
 
-        access_token = create_token()
-        self.session_manager.create_session(username_normalizado, access_token)
+        access_token = create_token(username=username_normalizado, role=user.role)
+        await run_in_db_thread(self.session_manager.create_session, username_normalizado, access_token, role=user.role)
 
-        response.set_cookie(
-            key="X-Sync.Ref",
-            value=access_token,
-            max_age=settings.TOKEN_SECONDS_EXP,
-            httponly=True,
-            samesite="lax",
-            path="/"
-        )
+        set_auth_cookie(response, access_token)
 
         return {"message": "Login correcto"}
 
+    def logout(self, request: Request, response: Response):
+        token_cookie = request.cookies.get("X-Sync.Ref")
+        if token_cookie:
+            try:
+                uuid_, exp = get_uuid_and_exp_from_token(token_cookie)
+                self.session_manager.revoke_session(uuid_, exp)
+            except ValueError:
+                pass
+
+        response.delete_cookie(key="X-Sync.Ref", path="/")
+
+        return {"message": "Sesión cerrada"}
+
     def get_user(self, username: str) -> Optional[Users]:
         try:
             statement = select(Users).where(Users.usu == username)
@@ -69,31 +81,37 @@ class LoginService:
             self.logger.error("Error al obtener el usuario: %s", e, exc_info=True)
             raise HTTPException(status_code=500, detail="Error interno al buscar el usuario")
 
-    def create_user(self, username: str, password: str, role: str):
+    async def create_user(self, username: str, password: str, role: str):
         try:
             username_normalizado = normalize_text(username)
 
-            existing_user = self.get_user(username_normalizado)
+            existing_user = await run_in_db_thread(call_and_release, self.session, self.get_user, username_normalizado)
             if existing_user:
                 return JSONResponse(
                     status_code=HTTPStatus.CONFLICT,
                     content={"message": f"El usuario '{username_normalizado}' ya existe."}
                 )
 
-            hashed_pwd = generate_password_hash(password)
+            hashed_pwd = await password_hasher.generate(password)
             user = Users(usu=username_normalizado, hash_pwd=hashed_pwd, role=role)
-
-            self.session.add(user)
-            self.session.commit()
-            self.session.refresh(user)
+            await run_in_db_thread(self._insert_user, user)
+            # Un usuario borrado y recreado con otro rol no debe heredar el de la caché.
+            self.session_manager.invalidate_user_sessions(user.usu)
 
             return JSONResponse(
                 status_code=HTTPStatus.CREATED,
                 content={"message": f"Usuario '{user.usu}' creado exitosamente."}
             )
+        except HTTPException:
+            raise
         except Exception as e:
             self.logger.error("Error al crear usuario: %s", e, exc_info=True)
             raise HTTPException(status_code=500, detail="Error interno al crear el usuario")
 
-    def authenticate_user(self, hashed_password: str, plain_password: str) -> bool:
-        return check_password_hash(hashed_password, plain_password)
\ No newline at end of file
+    def _insert_user(self, user: Users) -> None:
+        self.session.add(user)
+        self.session.commit()
+        self.session.refresh(user)
+
+    async def authenticate_user(self, hashed_password: str, plain_password: str) -> bool:
+        return await password_hasher.check(hashed_password, plain_password)
\ No newline at end of file
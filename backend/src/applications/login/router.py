@@ -7,6 +7,7 @@ from http import HTTPStatus
 from typing import Optional, List, Dict
 
 
+from core.executor import run_in_db_thread
 from core.manager_db_sync import get_session
 from .controller import LoginService
 from .schemas import (
@@ -29,21 +30,33 @@ async def login(
     response: Response,
     session: Session = Depends(get_session)
 ):
-    return LoginService(session, request.app.state.logger).login(
+    return await LoginService(session, request.app.state.logger).login(
         response=response,
         username=credentials.usu,
         password=credentials.pwd
     )
 
 
+@login_router.post("/logout")
+async def logout(
+    request: Request,
+    response: Response,
+    session: Session = Depends(get_session)
+):
+    return await run_in_db_thread(
+        LoginService(session, request.app.state.logger).logout,
+        request=request,
+        response=response
+    )
+
+
 @login_router.post("/alta-usuario")
 async def create_user(
     user_data: UserCreateRequest,
     request: Request,
     session: Session = Depends(get_session)
 ):
-
-    return LoginService(session, request.app.state.logger).create_user(
+    return await LoginService(session, request.app.state.logger).create_user(
         username=user_data.usu,
         password=user_data.pwd,
         role=user_data.role
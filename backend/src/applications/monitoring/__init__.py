@@ -0,0 +1 @@
+# backend\src\applications\monitoring\__init__.py
\ No newline at end of file
@@ -0,0 +1,24 @@
+# backend\src\applications\monitoring\router.py
+
+from fastapi import APIRouter, Depends, Query, Response
+
+from core.metrics import PROMETHEUS_CONTENT_TYPE, render_metrics
+from core.query_stats import query_stats
+from core.security import require_secret
+
+
+monitoring_router = APIRouter(
+    tags=["monitoring"],
+)
+
+
+@monitoring_router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Métricas del proceso (pools de BD, cachés, hash) para Prometheus."""
+    return Response(content=render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@monitoring_router.get("/admin/queries", dependencies=[Depends(require_secret)])
+async def top_queries(top: int = Query(20, ge=1, le=500)):
+    """Sentencias SQL con más tiempo acumulado en este proceso, con su histograma."""
+    return {"statements": query_stats.top(top)}
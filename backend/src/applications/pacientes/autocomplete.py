@@ -0,0 +1,148 @@
+# backend\src\applications\pacientes\autocomplete.py
+
+import asyncio
+import threading
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from logging import Logger
+from typing import Dict, List, Optional
+
+from sqlalchemy import func
+from sqlmodel import select
+
+from core.manager_db_sync import SessionLocal
+from core.settings import settings
+from core.utils import normalize_text
+from .models import Pacientes
+
+
+# `created_modificacion` lo fija now() (inicio de la transacción) o el reloj del
+# worker, así que un cambio puede confirmarse con una marca algo anterior a la última vista.
+_REFRESH_OVERLAP = timedelta(seconds=5)
+
+
+class UsernameIndex:
+    """
+    Índice en memoria de `Pacientes.username` (ya normalizados) para el
+    autocompletado: lista ordenada + `bisect`, sin consultar la BD por tecla.
+
+    Lo mantienen al día los hooks de `PacienteService` para los cambios de este
+    worker y `refresh_username_index` para los del resto.
+    """
+
+    def __init__(self):
+        self._usernames: List[str] = []  # ordenada
+        self._ids: Dict[str, int] = {}
+        self._by_id: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self.loaded = False
+        self.last_seen: Optional[datetime] = None
+
+    def load(self, rows) -> None:
+        """Sustituye el índice completo por `rows` (`id`, `username`)."""
+        by_id = {id: username for id, username in rows}
+        ids = {username: id for id, username in by_id.items()}
+        usernames = sorted(ids)
+        with self._lock:
+            self._usernames, self._ids, self._by_id = usernames, ids, by_id
+            self.loaded = True
+
+    def upsert(self, id: int, username: str) -> None:
+        with self._lock:
+            previous = self._by_id.get(id)
+            if previous == username:
+                return
+            if previous is not None:
+                self._discard(previous)
+            if username in self._ids:
+                # El username pasó a otro id (borrado y recreado en otro worker).
+                self._by_id.pop(self._ids[username], None)
+            else:
+                insort(self._usernames, username)
+            self._ids[username] = id
+            self._by_id[id] = username
+
+    def remove(self, id: int) -> None:
+        with self._lock:
+            username = self._by_id.pop(id, None)
+            if username is not None:
+                self._discard(username)
+
+    def _discard(self, username: str) -> None:
+        i = bisect_left(self._usernames, username)
+        if i < len(self._usernames) and self._usernames[i] == username:
+            del self._usernames[i]
+        self._ids.pop(username, None)
+
+    def search(self, prefix: str, limit: int) -> List[Dict[str, object]]:
+        """Los `limit` primeros usernames (orden alfabético) que empiezan por `prefix`."""
+        prefix = normalize_text(prefix)
+        if not prefix:
+            # Igual que `search_pacientes`: una búsqueda vacía no devuelve nada.
+            return []
+        result = []
+        with self._lock:
+            i = bisect_left(self._usernames, prefix)
+            while i < len(self._usernames) and len(result) < limit:
+                username = self._usernames[i]
+                if not username.startswith(prefix):
+                    break
+                result.append({"id": self._ids[username], "username": username})
+                i += 1
+        return result
+
+    def __len__(self) -> int:
+        return len(self._usernames)
+
+
+username_index = UsernameIndex()
+
+
+def _load_all(session) -> int:
+    # La marca se lee antes que las filas: lo que se confirme entre medias lo recoge el siguiente delta.
+    last_seen = session.exec(select(func.max(Pacientes.created_modificacion))).one()
+    rows = session.exec(select(Pacientes.id, Pacientes.username)).all()
+    username_index.load(rows)
+    username_index.last_seen = last_seen
+    return len(rows)
+
+
+def refresh_username_index() -> int:
+    """
+    Carga el índice completo en la primera pasada y, en las siguientes, solo
+    los pacientes creados o modificados desde la última. Si tras aplicarlos el
+    tamaño no cuadra con la tabla (borrados en otro worker), lo recarga entero.
+
+    :return: Número de filas leídas de `n_pacientes`.
+    """
+    with SessionLocal() as session:
+        if not username_index.loaded:
+            return _load_all(session)
+
+        statement = select(Pacientes.id, Pacientes.username, Pacientes.created_modificacion)
+        if username_index.last_seen is not None:
+            statement = statement.where(
+                Pacientes.created_modificacion > username_index.last_seen - _REFRESH_OVERLAP
+            )
+        rows = session.exec(statement).all()
+        for id, username, modificado in rows:
+            username_index.upsert(id, username)
+            if username_index.last_seen is None or modificado > username_index.last_seen:
+                username_index.last_seen = modificado
+
+        if session.exec(select(func.count()).select_from(Pacientes)).one() != len(username_index):
+            return len(rows) + _load_all(session)
+    return len(rows)
+
+
+async def run_username_index_refresher(logger: Logger) -> None:
+    """
+    Construye el índice de autocompletado al arrancar y lo mantiene al día.
+    Se lanza como tarea desde el `lifespan` de la aplicación.
+    """
+    while True:
+        try:
+            await asyncio.to_thread(refresh_username_index)
+        except Exception as e:
+            logger.error("Error al refrescar el índice de autocompletado: %s", e, exc_info=True)
+        await asyncio.sleep(settings.AUTOCOMPLETE_REFRESH_SECONDS)
@@ -1,5 +1,7 @@
 # backend\src\applications\pacientes\controller.py
 
+import json
+import time
 from datetime import datetime, timezone
 from sqlmodel import Session, select
 from sqlalchemy.exc import IntegrityError
@@ -7,22 +9,81 @@ from fastapi import HTTPException, Request, BackgroundTasks
 from logging import Logger
 from http import HTTPStatus
 from sqlalchemy.exc import SQLAlchemyError, OperationalError
-from typing import Dict, List, Any
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from typing import BinaryIO, Dict, List, Any, Iterator, Literal, Optional
 
-from core.utils import normalize_text
+from core.settings import settings
+from core.utils import decode_cursor, encode_cursor, normalize_text
+from .autocomplete import username_index
+from .importer import RosterFormatError, iter_roster_chunks, to_copy_buffer
 from .models import Pacientes
 from .schemas import (
+    PacienteBulkCreateModel,
     PacienteCreateModel,
     PacienteUpdateModel,
     PacienteResponseModel
 )
 
 
+def decode_names_cursor(cursor: Optional[str], order: Literal["id", "username"]) -> Any:
+    """
+    Última clave vista según el cursor `next` de `get_paciente_names_page`
+    (None sin cursor). El cursor viene del cliente: si no es válido para
+    `order`, 400 antes de tocar la BD.
+    """
+    if not cursor:
+        return None
+    try:
+        data = decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=str(e))
+    if data.get("o") != order or "k" not in data:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="El cursor no corresponde a este orden",
+        )
+    after = data["k"]
+    # Una clave de otro tipo no debe llegar a la BD (bool es subclase de int,
+    # de ahí la exclusión).
+    valid = (
+        isinstance(after, int) and not isinstance(after, bool)
+        if order == "id" else isinstance(after, str)
+    )
+    if not valid:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="Cursor inválido")
+    return after
+
+
 class PacienteService:
     def __init__(self, session: Session, logger: Logger):
         self.session = session
         self.logger = logger
 
+    def get_collection_version(self) -> str:
+        """
+        Versión barata del listado de pacientes: número de filas y última
+        modificación (`ix_n_pacientes_created_modificacion`). Cambia con cualquier
+        alta, baja o modificación, sin leer ni serializar las filas.
+        """
+        try:
+            count, last_modified = self.session.exec(
+                select(func.count(), func.max(Pacientes.created_modificacion)).select_from(Pacientes)
+            ).one()
+            return f"{count}:{last_modified.isoformat() if last_modified else '-'}"
+        except OperationalError as oe:
+            self.logger.error("Error de conexión a la base de datos: %s", oe, exc_info=True)
+            raise HTTPException(
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                detail="No se pudo conectar con la base de datos. Inténtelo más tarde."
+            )
+        except SQLAlchemyError as db_err:
+            self.logger.error("Error SQL: %s", db_err, exc_info=True)
+            raise HTTPException(
+                status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
+                detail="Error al consultar los nombres de los pacientes."
+            )
+
     def get_all_paciente_names(self) -> Dict[str, List[Dict[str, Any]]]:
         try:
             statement = select(Pacientes.id, Pacientes.username)
@@ -48,6 +109,126 @@ class PacienteService:
                 detail="Error inesperado al obtener los nombres de los pacientes."
             )
 
+    def get_paciente_names_page(
+        self,
+        limit: int,
+        after: Any = None,
+        order: Literal["id", "username"] = "id",
+    ) -> Dict[str, Any]:
+        """
+        Página de nombres con paginación keyset: filtra por la última clave vista
+        (`id` o `username`, ambas indexadas) en lugar de usar OFFSET, así que el
+        coste de cada página no depende de su posición ni del tamaño de la tabla.
+
+        `after` es la clave ya validada (`decode_names_cursor`) o None para la
+        primera página.
+        """
+        key = Pacientes.id if order == "id" else Pacientes.username
+
+        try:
+            statement = select(Pacientes.id, Pacientes.username).order_by(key).limit(limit + 1)
+            if after is not None:
+                statement = statement.where(key > after)
+            rows = self.session.exec(statement).all()
+
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                last_id, last_username = rows[-1]
+                next_cursor = encode_cursor({"o": order, "k": last_id if order == "id" else last_username})
+
+            return {
+                "nombres": [{"id": id, "username": username} for id, username in rows],
+                "next": next_cursor,
+            }
+        except OperationalError as oe:
+            self.logger.error("Error de conexión a la base de datos: %s", oe, exc_info=True)
+            raise HTTPException(
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                detail="No se pudo conectar con la base de datos. Inténtelo más tarde."
+            )
+        except SQLAlchemyError as db_err:
+            self.logger.error("Error SQL: %s", db_err, exc_info=True)
+            raise HTTPException(
+                status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
+                detail="Error al consultar los nombres de los pacientes."
+            )
+        except Exception as e:
+            self.logger.critical("Error inesperado: %s", e, exc_info=True)
+            raise HTTPException(
+                status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
+                detail="Error inesperado al obtener los nombres de los pacientes."
+            )
+
+    def iter_paciente_names(self, batch_size: Optional[int] = None) -> Iterator[bytes]:
+        """
+        Nombres de todos los pacientes en NDJSON, un bloque de `batch_size`
+        líneas (por defecto `EXPORT_BATCH_SIZE`) por iteración. `yield_per` abre un cursor de servidor: las filas
+        se leen por lotes y la memoria no depende del tamaño de la tabla.
+
+        La respuesta ya ha empezado cuando se consumen los bloques, así que un
+        error no puede convertirse en un código HTTP: se registra y se emite
+        una última línea `{"error": ...}` para que el cliente sepa que está incompleta.
+        """
+        statement = (
+            select(Pacientes.id, Pacientes.username)
+            .order_by(Pacientes.id)
+            .execution_options(yield_per=batch_size or settings.EXPORT_BATCH_SIZE)
+        )
+        try:
+            for partition in self.session.exec(statement).partitions():
+                yield "".join(
+                    json.dumps({"id": id, "username": username}, ensure_ascii=False) + "\n"
+                    for id, username in partition
+                ).encode()
+        except SQLAlchemyError as db_err:
+            self.logger.error("Error SQL en la exportación de nombres: %s", db_err, exc_info=True)
+            error = {"error": "Exportación interrumpida por un error de base de datos"}
+            yield (json.dumps(error, ensure_ascii=False) + "\n").encode()
+
+    def search_pacientes(self, q: str, limit: int) -> Dict[str, Any]:
+        """
+        Búsqueda por prefijo o similitud trigram sobre `username`, con la misma
+        normalización que el alta. Ambas condiciones usan el índice GIN
+        `ix_n_pacientes_username_trgm`; primero van los que empiezan por la
+        búsqueda y después los más parecidos.
+        """
+        termino = normalize_text(q)
+        if not termino:
+            return {"resultados": []}
+
+        # Patrón literal (no `startswith`, que concatena en SQL) para que el
+        # planificador vea una constante y use el índice trigram.
+        patron = termino.replace("/", "//").replace("%", "/%").replace("_", "/_") + "%"
+        prefijo = Pacientes.username.like(patron, escape="/")
+        score = func.similarity(Pacientes.username, termino)
+        statement = (
+            select(Pacientes.id, Pacientes.username, score.label("score"))
+            .where(prefijo | Pacientes.username.op("%")(termino))
+            .order_by(prefijo.desc(), score.desc(), Pacientes.username)
+            .limit(limit)
+        )
+        try:
+            rows = self.session.exec(statement).all()
+            return {
+                "resultados": [
+                    {"id": id, "username": username, "score": round(score, 4)}
+                    for id, username, score in rows
+                ]
+            }
+        except OperationalError as oe:
+            self.logger.error("Error de conexión a la base de datos: %s", oe, exc_info=True)
+            raise HTTPException(
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                detail="No se pudo conectar con la base de datos. Inténtelo más tarde."
+            )
+        except SQLAlchemyError as db_err:
+            self.logger.error("Error SQL: %s", db_err, exc_info=True)
+            raise HTTPException(
+                status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
+                detail="Error al buscar pacientes."
+            )
+
     def create_paciente(self,
         paciente_data: PacienteCreateModel,
     ) -> PacienteResponseModel:
@@ -59,6 +240,7 @@ class PacienteService:
             self.session.add(nuevo_paciente)
             self.session.commit()
             self.session.refresh(nuevo_paciente)
+            username_index.upsert(nuevo_paciente.id, nuevo_paciente.username)
 
             return PacienteResponseModel.model_validate(nuevo_paciente)
 
@@ -77,6 +259,126 @@ class PacienteService:
                 detail="Error al crear el paciente."
             )
 
+    def bulk_create_pacientes(self, data: PacienteBulkCreateModel, chunk_size: int) -> Dict[str, Any]:
+        """
+        Alta masiva: un `INSERT ... ON CONFLICT (username) DO NOTHING RETURNING`
+        de varias filas por lote de `chunk_size`, cada lote en su transacción.
+        Los usernames que no devuelve el INSERT ya existían (o se repiten en la
+        propia petición) y se informan como `duplicate`.
+        """
+        usernames = [normalize_text(p.username) for p in data.pacientes]
+        unicos = list(dict.fromkeys(usernames))
+        creados: Dict[str, int] = {}
+        lotes_confirmados = 0
+
+        try:
+            for start in range(0, len(unicos), chunk_size):
+                lote = unicos[start:start + chunk_size]
+                statement = (
+                    pg_insert(Pacientes)
+                    .values([{"username": username} for username in lote])
+                    .on_conflict_do_nothing(index_elements=[Pacientes.username])
+                    .returning(Pacientes.id, Pacientes.username)
+                )
+                rows = self.session.execute(statement).all()
+                self.session.commit()
+                lotes_confirmados += 1
+                creados.update((username, id) for id, username in rows)
+                for id, username in rows:
+                    username_index.upsert(id, username)
+        except OperationalError as oe:
+            self.session.rollback()
+            self.logger.error("Error de conexión en el alta masiva: %s", oe, exc_info=True)
+            raise HTTPException(
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                detail=f"No se pudo conectar con la base de datos. Lotes confirmados: {lotes_confirmados}."
+            )
+        except SQLAlchemyError as db_err:
+            self.session.rollback()
+            self.logger.error("Error SQL en el alta masiva: %s", db_err, exc_info=True)
+            raise HTTPException(
+                status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
+                detail=f"Error al crear los pacientes. Lotes confirmados: {lotes_confirmados}."
+            )
+
+        resultados = []
+        for username in usernames:
+            # `pop`: si el username se repite en la petición, solo la primera aparición es la creada.
+            id = creados.pop(username, None)
+            resultados.append({
+                "username": username,
+                "id": id,
+                "status": "created" if id is not None else "duplicate",
+            })
+        created = sum(r["status"] == "created" for r in resultados)
+        return {"created": created, "duplicates": len(resultados) - created, "resultados": resultados}
+
+    def import_pacientes(self, file: BinaryIO, filename: str, chunk_size: int) -> Dict[str, Any]:
+        """
+        Importa un listado csv/xlsx por bloques de `chunk_size` filas. Cada
+        bloque se carga con `COPY` en una tabla temporal y se fusiona con
+        `INSERT ... SELECT ... ON CONFLICT DO NOTHING`, en su propia transacción.
+        """
+        start = time.perf_counter()
+        resumen = {"filas": 0, "vacias": 0, "created": 0, "duplicates": 0, "lotes": 0}
+
+        try:
+            for usernames in iter_roster_chunks(file, filename, chunk_size):
+                validos = usernames[usernames != ""]
+                resumen["filas"] += len(usernames)
+                resumen["vacias"] += len(usernames) - len(validos)
+                if validos.empty:
+                    continue
+
+                connection = self.session.connection()
+                connection.execute(text(
+                    "CREATE TEMP TABLE IF NOT EXISTS pacientes_import "
+                    "(username VARCHAR(355)) ON COMMIT DELETE ROWS"
+                ))
+                with connection.connection.cursor() as cursor:
+                    cursor.copy_expert(
+                        "COPY pacientes_import (username) FROM STDIN WITH (FORMAT csv)",
+                        to_copy_buffer(validos),
+                    )
+                result = connection.execute(text(
+                    "INSERT INTO n_pacientes (username) "
+                    "SELECT DISTINCT username FROM pacientes_import "
+                    "ON CONFLICT (username) DO NOTHING"
+                ))
+                self.session.commit()
+
+                resumen["lotes"] += 1
+                resumen["created"] += result.rowcount
+                resumen["duplicates"] += len(validos) - result.rowcount
+        except RosterFormatError as e:
+            self.session.rollback()
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=str(e))
+        except OperationalError as oe:
+            self.session.rollback()
+            self.logger.error("Error de conexión en la importación: %s", oe, exc_info=True)
+            raise HTTPException(
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                detail=f"No se pudo conectar con la base de datos. Lotes confirmados: {resumen['lotes']}."
+            )
+        except SQLAlchemyError as db_err:
+            self.session.rollback()
+            self.logger.error("Error SQL en la importación: %s", db_err, exc_info=True)
+            raise HTTPException(
+                status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
+                detail=f"Error al importar los pacientes. Lotes confirmados: {resumen['lotes']}."
+            )
+        except Exception as e:
+            self.session.rollback()
+            self.logger.error("Error al leer el fichero %s: %s", filename, e, exc_info=True)
+            raise HTTPException(
+                status_code=HTTPStatus.BAD_REQUEST,
+                detail=f"No se pudo leer el fichero. Lotes confirmados: {resumen['lotes']}."
+            )
+
+        resumen["segundos"] = round(time.perf_counter() - start, 3)
+        self.logger.info("Importación de %s: %s", filename, resumen)
+        return resumen
+
     def update_paciente(self, paciente_id: int, data: PacienteUpdateModel) -> PacienteResponseModel:
         try:
             paciente = self.session.get(Pacientes, paciente_id)
@@ -95,6 +397,7 @@ class PacienteService:
             self.session.add(paciente)
             self.session.commit()
             self.session.refresh(paciente)
+            username_index.upsert(paciente.id, paciente.username)
 
             return PacienteResponseModel.model_validate(paciente)
 
@@ -125,6 +428,7 @@ class PacienteService:
 
             self.session.delete(paciente)
             self.session.commit()
+            username_index.remove(paciente_id)
             return {"message": "Paciente eliminado correctamente."}
         except OperationalError as oe:
             self.logger.error("Error de conexión: %s", oe, exc_info=True)
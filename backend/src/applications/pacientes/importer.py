@@ -0,0 +1,99 @@
+# backend\src\applications\pacientes\importer.py
+
+import io
+from typing import BinaryIO, Iterator
+
+import pandas as pd
+from openpyxl import load_workbook
+
+
+USERNAME_COLUMN = "username"
+SUPPORTED_EXTENSIONS = (".csv", ".xlsx")
+
+
+class RosterFormatError(ValueError):
+    """El fichero no tiene el formato esperado (extensión o cabecera)."""
+
+
+def _is_username(column) -> bool:
+    return str(column).strip().lower() == USERNAME_COLUMN
+
+
+def normalize_usernames(usernames: pd.Series) -> pd.Series:
+    """Versión vectorizada de `core.utils.normalize_text` para una columna entera."""
+    return (
+        usernames.astype("string")
+        .str.normalize("NFKD")
+        .str.encode("ascii", "ignore")
+        .str.decode("ascii")
+        .str.casefold()
+        .str.replace(r"\s+", " ", regex=True)
+        .str.strip()
+        .str.upper()
+    )
+
+
+def _iter_csv(file: BinaryIO, chunk_size: int) -> Iterator[pd.Series]:
+    try:
+        reader = pd.read_csv(
+            file,
+            usecols=_is_username,
+            dtype="string",
+            encoding="utf-8-sig",
+            keep_default_na=False,
+            chunksize=chunk_size,
+        )
+        for chunk in reader:
+            if chunk.columns.empty:
+                raise RosterFormatError(f"Falta la columna '{USERNAME_COLUMN}'")
+            yield chunk.iloc[:, 0]
+    except pd.errors.EmptyDataError as e:
+        raise RosterFormatError("El fichero está vacío") from e
+
+
+def _iter_xlsx(file: BinaryIO, chunk_size: int) -> Iterator[pd.Series]:
+    # read_only: openpyxl lee la hoja como stream en lugar de cargarla entera.
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            raise RosterFormatError("El fichero está vacío")
+        try:
+            index = next(i for i, column in enumerate(header) if _is_username(column))
+        except StopIteration:
+            raise RosterFormatError(f"Falta la columna '{USERNAME_COLUMN}'") from None
+
+        chunk = []
+        for row in rows:
+            value = row[index] if index < len(row) else None
+            chunk.append("" if value is None else str(value))
+            if len(chunk) >= chunk_size:
+                yield pd.Series(chunk, dtype="string")
+                chunk = []
+        if chunk:
+            yield pd.Series(chunk, dtype="string")
+    finally:
+        workbook.close()
+
+
+def iter_roster_chunks(file: BinaryIO, filename: str, chunk_size: int) -> Iterator[pd.Series]:
+    """
+    Columna `username` de un listado csv/xlsx, en bloques de `chunk_size`
+    filas ya normalizados. Nunca se carga el fichero completo en memoria.
+    """
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        chunks = _iter_csv(file, chunk_size)
+    elif name.endswith(".xlsx"):
+        chunks = _iter_xlsx(file, chunk_size)
+    else:
+        raise RosterFormatError(f"Formato no soportado; se admite: {', '.join(SUPPORTED_EXTENSIONS)}")
+
+    for chunk in chunks:
+        yield normalize_usernames(chunk)
+
+
+def to_copy_buffer(usernames: pd.Series) -> io.StringIO:
+    """Bloque en formato CSV para `COPY ... FROM STDIN`."""
+    return io.StringIO(usernames.to_csv(index=False, header=False))
@@ -3,7 +3,7 @@
 from typing import Optional
 from datetime import datetime
 from sqlmodel import SQLModel, Field, Relationship, Column, ForeignKey, PrimaryKeyConstraint
-from sqlalchemy import func, CheckConstraint
+from sqlalchemy import func, CheckConstraint, Index
 import sqlalchemy.dialects.postgresql as pg
 
 
@@ -12,6 +12,17 @@ class Pacientes(SQLModel, table=True):
     Represents a pacientes in the database.
     """
     __tablename__ = 'n_pacientes'   
+    __table_args__ = (
+        # Búsqueda por prefijo/similitud (pg_trgm) en /pacientes/search
+        Index(
+            "ix_n_pacientes_username_trgm",
+            "username",
+            postgresql_using="gin",
+            postgresql_ops={"username": "gin_trgm_ops"},
+        ),
+        # max(created_modificacion) para la versión (ETag) del listado
+        Index("ix_n_pacientes_created_modificacion", "created_modificacion"),
+    )
     
     id: int = Field(default=None, primary_key=True)
     username: str = Field(sa_column=Column(pg.VARCHAR(355), nullable=False, unique=True, index=True))
@@ -2,17 +2,29 @@
 
 from fastapi import (APIRouter, Depends, Response, Query, UploadFile, File, 
                      HTTPException, Form, Request, BackgroundTasks)
-from sqlmodel import Session
+from sqlmodel import Session, select
 from fastapi.responses import StreamingResponse
 from http import HTTPStatus
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Literal
 
 
-from core.manager_db_sync import get_session
+from core.deadline import request_timeout
+from core.export import ExportFormat, export_response, export_slots, stream_from_session
+from core.executor import run_in_db_thread, run_in_export_thread
+from core.lazy_session import call_and_release
+from core.manager_db_sync import get_session, get_read_session, read_sessionmaker
 from core.security import require_secret, require_roles
-from .controller import PacienteService
+from core.settings import settings
+from core.utils import etag_matches, make_etag
+from .autocomplete import username_index
+from .controller import PacienteService, decode_names_cursor
+from .models import Pacientes
 from .schemas import (
+    PacienteBulkCreateModel,
+    PacienteBulkResponseModel,
+    PacienteImportResponseModel,
     PacienteNombresResponseModel,
+    PacienteSearchResponseModel,
     PacienteCreateModel,
     PacienteUpdateModel,
     PacienteResponseModel
@@ -28,15 +40,149 @@ paciente_router = APIRouter(
 )
 
 
-@paciente_router.get("/nombres", response_model=PacienteNombresResponseModel)
-async def get_paciente_names(request: Request, session: Session = Depends(get_session)):
+def _list_etag(request: Request, version: str) -> str:
+    # La misma versión de la tabla da páginas distintas según los parámetros.
+    return make_etag(request.url.path, request.url.query, version)
+
+
+@paciente_router.get(
+    "/nombres",
+    response_model=PacienteNombresResponseModel,
+    responses={HTTPStatus.NOT_MODIFIED: {"description": "El listado no ha cambiado (If-None-Match)"}},
+)
+async def get_paciente_names(
+    request: Request,
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Valor `next` de la página anterior"),
+    order: Literal["id", "username"] = Query("id"),
+    todos: bool = Query(False, description="Devuelve la lista completa sin paginar"),
+    session: Session = Depends(get_read_session)
+):
     """
-    Endpoint para obtener la lista de nombres de todos los pacientes.
+    Endpoint para obtener los nombres de los pacientes, paginados por cursor.
+
+    Devuelve un `ETag` con la versión del listado; si el cliente lo envía en
+    `If-None-Match` y nada ha cambiado, responde 304 sin leer las filas.
 
     Returns:
-        List[str]: Lista con los nombres de usuario de los pacientes.
+        PacienteNombresResponseModel: Página de nombres y cursor `next` de la
+        siguiente (None en la última). Con `todos=true`, la lista completa.
+    """
+    after = None if todos else decode_names_cursor(cursor, order)  # 400 antes de ir a la BD
+    service = PacienteService(session, request.app.state.logger)
+    if_none_match = request.headers.get("if-none-match")
+
+    def load():
+        # Versión y filas en una sola llamada al executor (ver core.executor). La
+        # versión se lee antes que las filas: si cambian entre medias, el ETag
+        # queda antiguo y el siguiente sondeo recibe el listado completo.
+        etag = _list_etag(request, service.get_collection_version())
+        if etag_matches(if_none_match, etag):
+            return etag, None
+        if todos:
+            return etag, service.get_all_paciente_names()
+        return etag, service.get_paciente_names_page(limit, after, order)
+
+    etag, nombres = await run_in_db_thread(load)
+    if nombres is None:
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    return nombres
+
+
+@paciente_router.get("/search", response_model=PacienteSearchResponseModel)
+async def search_pacientes(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=355),
+    limit: int = Query(10, ge=1, le=100),
+    session: Session = Depends(get_read_session)
+):
+    """
+    Busca pacientes por prefijo o parecido del nombre de usuario (pg_trgm)
+    y devuelve los `limit` mejores.
+    """
+    return await run_in_db_thread(PacienteService(session, request.app.state.logger).search_pacientes, q, limit)
+
+
+@paciente_router.get("/autocomplete", response_model=PacienteNombresResponseModel)
+async def autocomplete_pacientes(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=355),
+    limit: int = Query(10, ge=1, le=50),
+    session: Session = Depends(get_read_session)
+):
+    """
+    Autocompletado por prefijo del nombre de usuario, servido desde el índice
+    en memoria sin tocar la BD. Mientras el índice no está cargado (arranque o
+    AUTOCOMPLETE_ENABLED=false) recurre a la búsqueda en BD.
+    """
+    if username_index.loaded:
+        return {"nombres": username_index.search(q, limit)}
+    resultados = await run_in_db_thread(PacienteService(session, request.app.state.logger).search_pacientes, q, limit)
+    return {"nombres": resultados["resultados"]}
+
+
+@paciente_router.get(
+    "/nombres/stream",
+    response_class=StreamingResponse,
+    dependencies=[Depends(request_timeout(600))],
+)
+async def stream_paciente_names(request: Request, session: Session = Depends(get_read_session)):
     """
-    return PacienteService(session, request.app.state.logger).get_all_paciente_names()
+    Exporta los nombres de todos los pacientes en NDJSON (una línea
+    `{"id": ..., "username": ...}` por paciente), en streaming.
+
+    El primer bloque sale en cuanto llega el primer lote del cursor y la
+    memoria del proceso no crece con la tabla. La sesión es propia del stream:
+    las dependencias con `yield` se cierran antes de enviar el cuerpo (la de
+    `session` solo sirve para la versión del ETag). Admite `If-None-Match`.
+
+    Como las exportaciones, corre en `export_executor` y ocupa un hueco de
+    `EXPORT_WORKERS` (503 si no queda ninguno): los streams no compiten con la
+    autenticación y el CRUD por los hilos y conexiones de `db_executor`.
+    """
+    version = await run_in_db_thread(
+        call_and_release, session, PacienteService(session, request.app.state.logger).get_collection_version
+    )
+    etag = _list_etag(request, version)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=HTTPStatus.NOT_MODIFIED, headers={"ETag": etag})
+
+    logger = request.app.state.logger
+    body = stream_from_session(
+        read_sessionmaker(request),
+        lambda stream_session: PacienteService(stream_session, logger).iter_paciente_names(),
+        "pacientes.ndjson",
+    )
+    return StreamingResponse(
+        body,
+        media_type="application/x-ndjson",
+        headers={"ETag": etag, "Cache-Control": "private, no-cache"},
+    )
+
+
+@paciente_router.get("/export", dependencies=[Depends(request_timeout(1800))])
+async def export_pacientes(request: Request, formato: ExportFormat = Query("csv")):
+    """
+    Descarga la tabla de pacientes en csv (streaming) o xlsx, leída con un
+    cursor de servidor en el pool de hilos de exportación.
+    """
+    statement = select(
+        Pacientes.id,
+        Pacientes.username,
+        Pacientes.fecha_creacion,
+        Pacientes.created_modificacion,
+    ).order_by(Pacientes.id)
+    return await export_response(
+        read_sessionmaker(request),
+        statement,
+        ["id", "username", "fecha_creacion", "created_modificacion"],
+        formato,
+        "pacientes",
+    )
 
 
 @paciente_router.post("/add", response_model=PacienteResponseModel)
@@ -48,7 +194,58 @@ async def create_paciente(
     """
     Crea un nuevo paciente.
     """
-    return PacienteService(session, request.app.state.logger).create_paciente(data)
+    return await run_in_db_thread(PacienteService(session, request.app.state.logger).create_paciente, data)
+
+
+@paciente_router.post("/bulk", response_model=PacienteBulkResponseModel)
+async def bulk_create_pacientes(
+    data: PacienteBulkCreateModel,
+    request: Request,
+    session: Session = Depends(get_session)
+):
+    """
+    Crea varios pacientes en una sola petición, en lotes de
+    `PACIENTES_BULK_CHUNK_SIZE`. Los usernames ya existentes no son un error:
+    se devuelven con estado `duplicate`.
+    """
+    return await run_in_db_thread(
+        PacienteService(session, request.app.state.logger).bulk_create_pacientes,
+        data,
+        settings.PACIENTES_BULK_CHUNK_SIZE,
+    )
+
+
+@paciente_router.post(
+    "/import",
+    response_model=PacienteImportResponseModel,
+    dependencies=[Depends(request_timeout(1800))],
+)
+async def import_pacientes(
+    request: Request,
+    file: UploadFile = File(..., description="Listado csv o xlsx con una columna `username`"),
+    session: Session = Depends(get_session)
+):
+    """
+    Importa un listado de pacientes (csv/xlsx). El fichero se procesa por
+    bloques de `PACIENTES_IMPORT_CHUNK_SIZE` filas, así que la memoria no
+    depende de su tamaño; los usernames existentes cuentan como duplicados.
+
+    Como una exportación, retiene una conexión durante minutos: va a
+    `export_executor` dentro de un hueco de `export_slots` (503 si no lo hay).
+    """
+    try:
+        slot = export_slots.acquire()
+        try:
+            return await run_in_export_thread(
+                PacienteService(session, request.app.state.logger).import_pacientes,
+                file.file,
+                file.filename,
+                settings.PACIENTES_IMPORT_CHUNK_SIZE,
+            )
+        finally:
+            slot.release()
+    finally:
+        await file.close()
 
 
 @paciente_router.put("/update/{paciente_id}", response_model=PacienteResponseModel)
@@ -61,7 +258,7 @@ async def update_paciente(
     """
     Actualiza los datos de un paciente existente.
     """
-    return PacienteService(session, request.app.state.logger).update_paciente(paciente_id, data)
+    return await run_in_db_thread(PacienteService(session, request.app.state.logger).update_paciente, paciente_id, data)
 
 
 @paciente_router.delete("/remove/{paciente_id}")
@@ -73,4 +270,4 @@ async def delete_paciente(
     """
     Elimina un paciente por su ID.
     """
-    return PacienteService(session, request.app.state.logger).delete_paciente(paciente_id)
\ No newline at end of file
+    return await run_in_db_thread(PacienteService(session, request.app.state.logger).delete_paciente, paciente_id)
\ No newline at end of file
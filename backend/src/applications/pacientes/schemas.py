@@ -1,8 +1,10 @@
 # backend\src\applications\pacientes\schemas.py
 
 from datetime import datetime
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, Field
+from typing import Literal, Optional, List
+
+from core.settings import settings
 
 
 class PacienteNombreItem(BaseModel):
@@ -12,6 +14,7 @@ class PacienteNombreItem(BaseModel):
 
 class PacienteNombresResponseModel(BaseModel):
     nombres: List[PacienteNombreItem]
+    next: Optional[str] = None  # cursor de la página siguiente; None en la última
 
     model_config = {
         "json_schema_extra": {
@@ -20,16 +23,52 @@ class PacienteNombresResponseModel(BaseModel):
                     {"id": 1, "username": "juanperez"},
                     {"id": 2, "username": "mariagonzalez"},
                     {"id": 3, "username": "carlossanchez"}
-                ]
+                ],
+                "next": "eyJvIjoiaWQiLCJrIjozfQ"
             }
         }
     }
 
 
+class PacienteSearchItem(BaseModel):
+    id: int
+    username: str
+    score: float  # similitud trigram con la búsqueda (0-1)
+
+
+class PacienteSearchResponseModel(BaseModel):
+    resultados: List[PacienteSearchItem]
+
+
 class PacienteCreateModel(BaseModel):
     username: str
 
 
+class PacienteBulkCreateModel(BaseModel):
+    pacientes: List[PacienteCreateModel] = Field(min_length=1, max_length=settings.PACIENTES_BULK_MAX_ROWS)
+
+
+class PacienteBulkItem(BaseModel):
+    username: str  # ya normalizado
+    id: Optional[int] = None  # solo en los creados
+    status: Literal["created", "duplicate"]
+
+
+class PacienteBulkResponseModel(BaseModel):
+    created: int
+    duplicates: int
+    resultados: List[PacienteBulkItem]  # en el orden de la petición
+
+
+class PacienteImportResponseModel(BaseModel):
+    filas: int  # filas de datos leídas del fichero
+    vacias: int  # username vacío tras normalizar; no se importan
+    created: int
+    duplicates: int  # ya existían o se repiten en el fichero
+    lotes: int
+    segundos: float
+
+
 class PacienteUpdateModel(BaseModel):
     username: Optional[str] = None
 
@@ -0,0 +1 @@
+# backend\src\benchmarks\__init__.py
@@ -0,0 +1,81 @@
+# backend\src\benchmarks\_common.py
+
+"""
+Utilidades compartidas por los scripts de `benchmarks/`.
+
+Los scripts se ejecutan desde `backend/src` con las mismas variables de
+entorno que el servicio, por ejemplo:
+
+    python -m benchmarks.auth_modes --peticiones 5000 --concurrencia 50
+"""
+
+import asyncio
+import logging
+import statistics
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+
+import httpx
+from fastapi import FastAPI
+
+
+logger = logging.getLogger("benchmarks")
+
+
+def percentiles(latencias_ms: List[float]) -> Dict[str, float]:
+    """p50/p95/p99 y máximo de una lista de latencias en milisegundos."""
+    ordenadas = sorted(latencias_ms)
+    if len(ordenadas) < 2:
+        valor = ordenadas[0] if ordenadas else 0.0
+        return {"p50": valor, "p95": valor, "p99": valor, "max": valor}
+    cortes = statistics.quantiles(ordenadas, n=100, method="inclusive")
+    return {"p50": cortes[49], "p95": cortes[94], "p99": cortes[98], "max": ordenadas[-1]}
+
+
+def imprimir(nombre: str, latencias_ms: List[float], segundos: float) -> None:
+    """Una línea por escenario: operaciones, throughput y percentiles."""
+    p = percentiles(latencias_ms)
+    ops = len(latencias_ms) / segundos if segundos else 0.0
+    print(
+        f"{nombre:<32} n={len(latencias_ms):<7} {ops:>10.1f} op/s   "
+        f"p50={p['p50']:.2f} ms  p95={p['p95']:.2f} ms  p99={p['p99']:.2f} ms  max={p['max']:.2f} ms"
+    )
+
+
+def medir(func: Callable[[], Any], repeticiones: int) -> List[float]:
+    """Latencias (ms) de `repeticiones` llamadas secuenciales a `func`."""
+    latencias = []
+    for _ in range(repeticiones):
+        start = time.perf_counter()
+        func()
+        latencias.append((time.perf_counter() - start) * 1000)
+    return latencias
+
+
+async def carga(
+    func: Callable[[], Awaitable[Any]],
+    peticiones: int,
+    concurrencia: int,
+) -> tuple[List[float], float]:
+    """
+    Lanza `peticiones` llamadas a `func` con `concurrencia` en vuelo a la vez.
+
+    :return: (latencias en ms, duración total en segundos).
+    """
+    latencias: List[float] = []
+    restantes = iter(range(peticiones))
+
+    async def worker():
+        for _ in restantes:
+            start = time.perf_counter()
+            await func()
+            latencias.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrencia)))
+    return latencias, time.perf_counter() - start
+
+
+def cliente(app: FastAPI) -> httpx.AsyncClient:
+    """Cliente HTTP en proceso (sin red ni lifespan) contra `app`."""
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
@@ -0,0 +1,103 @@
+# backend\src\benchmarks\auth_modes.py
+
+"""
+Benchmark de `require_auth`: `AUTH_MODE=session` frente a `AUTH_MODE=stateless`.
+
+Monta una app mínima con un endpoint protegido por `require_roles("admin")`
+y la llama en proceso (httpx + ASGITransport) siempre con la misma cookie.
+
+- stateless: solo verifica la firma del JWT y la lista de revocados.
+- session: además busca la sesión en `SESSION_STORE`. Por defecto `memory`,
+  que no necesita BD; con `--store sql` usa la BD configurada (crea el
+  usuario `bench_admin` si no existe).
+- `--sin-cache` desactiva la caché de sesiones validadas, para medir el
+  almacén en cada petición y no solo el primer fallo.
+
+    python -m benchmarks.auth_modes --peticiones 5000 --concurrencia 50
+    python -m benchmarks.auth_modes --store sql --sin-cache
+"""
+
+import argparse
+import asyncio
+
+from fastapi import Depends, FastAPI
+
+from core.cache import session_cache
+from core.security import require_roles
+from core.session_manager import SessionManager
+from core.settings import settings
+from core.token_utils import AuthCookieMiddleware, create_token
+
+from ._common import carga, cliente, imprimir, logger
+
+
+USERNAME = "bench_admin"
+ROLE = "admin"
+
+
+def crear_app() -> FastAPI:
+    app = FastAPI()
+    app.state.logger = logger
+    app.add_middleware(AuthCookieMiddleware)
+
+    @app.get("/protegido", dependencies=[Depends(require_roles(ROLE))])
+    async def protegido():
+        return {"ok": True}
+
+    return app
+
+
+def crear_sesion(store: str) -> str:
+    """Emite un token con claims `usu`/`role` y registra su sesión en `store`."""
+    token = create_token(username=USERNAME, role=ROLE)
+    if store == "memory":
+        SessionManager(None, logger).create_session(USERNAME, token, ROLE)
+        return token
+
+    from core.manager_db_sync import SessionLocal, init_db
+    from core.models.users import Users
+
+    init_db(logger)
+    with SessionLocal() as session:
+        if session.get(Users, USERNAME) is None:
+            session.add(Users(usu=USERNAME, role=ROLE))
+            session.commit()
+        SessionManager(session, logger).create_session(USERNAME, token, ROLE)
+    return token
+
+
+async def escenario(app: FastAPI, modo: str, token: str, peticiones: int, concurrencia: int) -> None:
+    settings.AUTH_MODE = modo
+    async with cliente(app) as client:
+        client.cookies.set("X-Sync.Ref", token)
+
+        async def peticion():
+            response = await client.get("/protegido")
+            if response.status_code != 200:
+                raise RuntimeError(f"{modo}: respuesta {response.status_code} {response.text}")
+
+        await carga(peticion, min(peticiones, 200), concurrencia)  # calentamiento
+        latencias, segundos = await carga(peticion, peticiones, concurrencia)
+    imprimir(f"{modo} ({settings.SESSION_STORE})" if modo == "session" else modo, latencias, segundos)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--peticiones", type=int, default=5000)
+    parser.add_argument("--concurrencia", type=int, default=50)
+    parser.add_argument("--store", choices=["memory", "sql"], default="memory")
+    parser.add_argument("--sin-cache", action="store_true")
+    args = parser.parse_args()
+
+    settings.SESSION_STORE = args.store
+    if args.sin_cache:
+        session_cache.maxsize = 0  # `set` no guarda nada
+
+    token = crear_sesion(args.store)
+    app = crear_app()
+    for modo in ("session", "stateless"):
+        asyncio.run(escenario(app, modo, token, args.peticiones, args.concurrencia))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# backend\src\benchmarks\auth_roles.py
+
+"""
+Benchmark de la resolución de sesión y rol en `require_roles` (contra BD).
+
+Compara, por petición protegida que no acierta en la caché de sesiones:
+
+- dos_consultas: `sesiones` y después `usuarios` (el camino anterior).
+- join: `SQLSessionStore.get`, sesiones ⋈ usuarios en un único viaje.
+
+Cada llamada abre su propia sesión, como una petición real. Crea
+`--sesiones` sesiones del usuario `bench_admin` y las borra al terminar.
+
+    python -m benchmarks.auth_roles --sesiones 10000 --repeticiones 2000
+"""
+
+import argparse
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlmodel import delete, insert, select
+
+from core.manager_db_sync import SessionLocal, init_db
+from core.models.sessions import Sessions
+from core.models.users import Users
+from core.session_store import SQLSessionStore
+
+from ._common import imprimir, logger, medir
+
+
+USERNAME = "bench_admin"
+ROLE = "admin"
+
+
+def dos_consultas(uuid_: str) -> None:
+    with SessionLocal() as session:
+        sesion = session.exec(select(Sessions).where(Sessions.token == uuid_)).first()
+        user = session.exec(select(Users).where(Users.usu == sesion.usu)).first()
+        assert user.role == ROLE
+
+
+def join(uuid_: str) -> None:
+    with SessionLocal() as session:
+        sesion = SQLSessionStore(session).get(uuid_)
+        assert sesion["role"] == ROLE
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sesiones", type=int, default=10000)
+    parser.add_argument("--repeticiones", type=int, default=2000)
+    args = parser.parse_args()
+
+    init_db(logger)
+    exp = datetime.now(timezone.utc) + timedelta(hours=1)
+    uuids = [f"bench-{uuid.uuid4()}" for _ in range(args.sesiones)]
+    with SessionLocal() as session:
+        if session.get(Users, USERNAME) is None:
+            session.add(Users(usu=USERNAME, role=ROLE))
+        session.execute(insert(Sessions), [{"token": u, "usu": USERNAME, "exp": exp} for u in uuids])
+        session.commit()
+
+    try:
+        for nombre, func in (("dos_consultas", dos_consultas), ("join", join)):
+            medir(lambda: func(random.choice(uuids)), min(args.repeticiones, 200))  # calentamiento
+            latencias = medir(lambda: func(random.choice(uuids)), args.repeticiones)
+            imprimir(nombre, latencias, sum(latencias) / 1000)
+    finally:
+        with SessionLocal() as session:
+            session.exec(delete(Sessions).where(Sessions.token.in_(uuids)))
+            session.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# backend\src\benchmarks\bulk_insert.py
+
+"""
+Benchmark de throughput del alta de pacientes: una a una frente a `/pacientes/bulk` (contra BD).
+
+- por_fila: `create_paciente` con una sesión por paciente, como N llamadas a
+  `POST /pacientes/add` (commit y refresh en cada una).
+- bulk: `bulk_create_pacientes` con los mismos N pacientes (otros usernames)
+  en lotes de `--chunk-size`.
+- bulk duplicados: repite el bulk anterior; todas las filas son `duplicate`.
+
+Al terminar se borran, por id, solo los pacientes que ha creado el benchmark:
+los usernames pasan por `normalize_text`, así que no hay marca que un
+paciente real no pueda tener.
+
+    python -m benchmarks.bulk_insert --filas 5000 --chunk-size 1000
+"""
+
+import argparse
+import time
+from typing import List
+
+from sqlmodel import delete
+
+from applications.pacientes.controller import PacienteService
+from applications.pacientes.models import Pacientes
+from applications.pacientes.schemas import PacienteBulkCreateModel, PacienteCreateModel
+from core.manager_db_sync import SessionLocal, init_db
+from core.settings import settings
+
+from ._common import logger
+
+
+PREFIJO = "BENCH_BULK_"
+
+
+def imprimir_filas(nombre: str, filas: int, segundos: float) -> None:
+    print(f"{nombre:<20} {filas:>7} filas en {segundos:8.2f} s   {filas / segundos:>10.1f} filas/s")
+
+
+def por_fila(usernames, creados: List[int]) -> float:
+    start = time.perf_counter()
+    for username in usernames:
+        with SessionLocal() as session:
+            paciente = PacienteService(session, logger).create_paciente(PacienteCreateModel(username=username))
+        creados.append(paciente.id)
+    return time.perf_counter() - start
+
+
+def bulk(usernames, chunk_size: int, creados: List[int]) -> float:
+    data = PacienteBulkCreateModel.model_construct(
+        pacientes=[PacienteCreateModel(username=username) for username in usernames]
+    )
+    start = time.perf_counter()
+    with SessionLocal() as session:
+        resultado = PacienteService(session, logger).bulk_create_pacientes(data, chunk_size)
+    segundos = time.perf_counter() - start
+    creados.extend(r["id"] for r in resultado["resultados"] if r["status"] == "created")
+    return segundos
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filas", type=int, default=5000)
+    parser.add_argument("--chunk-size", type=int, default=settings.PACIENTES_BULK_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    init_db(logger)
+    creados: List[int] = []
+    try:
+        usernames = [f"{PREFIJO}F{i:09d}" for i in range(args.filas)]
+        imprimir_filas("por_fila", args.filas, por_fila(usernames, creados))
+
+        usernames = [f"{PREFIJO}B{i:09d}" for i in range(args.filas)]
+        imprimir_filas("bulk", args.filas, bulk(usernames, args.chunk_size, creados))
+        imprimir_filas("bulk duplicados", args.filas, bulk(usernames, args.chunk_size, creados))
+    finally:
+        with SessionLocal() as session:
+            for start in range(0, len(creados), 10000):
+                session.exec(delete(Pacientes).where(Pacientes.id.in_(creados[start:start + 10000])))
+            session.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# backend\src\benchmarks\db_executor.py
+
+"""
+Benchmark de carga: servicio síncrono en el event loop frente a `db_executor` (contra BD).
+
+Monta una app con dos endpoints `async def` que hacen la misma consulta
+síncrona (`SELECT pg_sleep(--espera)` con `SessionLocal`):
+
+- bloqueante: la llama directamente, como hacían los routers antes.
+- executor: la llama con `run_in_db_thread`.
+
+Mientras cada endpoint recibe `--concurrencia` peticiones en paralelo, un
+cliente aparte mide `/ping` (sin BD) secuencialmente: su latencia es el
+tiempo que el event loop tarda en atender a cualquier otra petición.
+
+    python -m benchmarks.db_executor --peticiones 500 --concurrencia 20
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI
+from sqlalchemy import text
+
+from core.executor import run_in_db_thread
+from core.manager_db_sync import SessionLocal
+
+from ._common import carga, cliente, imprimir
+
+
+def crear_app(espera: float) -> FastAPI:
+    app = FastAPI()
+    consulta = text("SELECT pg_sleep(:s)").bindparams(s=espera) if espera > 0 else text("SELECT 1")
+
+    def servicio():
+        with SessionLocal() as session:
+            session.execute(consulta)
+
+    @app.get("/bloqueante")
+    async def bloqueante():
+        servicio()
+        return {"ok": True}
+
+    @app.get("/executor")
+    async def executor():
+        await run_in_db_thread(servicio)
+        return {"ok": True}
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return app
+
+
+async def escenario(app: FastAPI, ruta: str, peticiones: int, concurrencia: int) -> None:
+    async with cliente(app) as client:
+
+        async def peticion():
+            response = await client.get(ruta)
+            response.raise_for_status()
+
+        await carga(peticion, min(peticiones, concurrencia), concurrencia)  # calentamiento
+
+        pings = []
+        terminado = asyncio.Event()
+
+        async def medir_ping():
+            while not terminado.is_set():
+                start = time.perf_counter()
+                await client.get("/ping")
+                pings.append((time.perf_counter() - start) * 1000)
+                await asyncio.sleep(0.01)
+
+        sonda = asyncio.create_task(medir_ping())
+        try:
+            latencias, segundos = await carga(peticion, peticiones, concurrencia)
+        finally:
+            terminado.set()
+            await sonda
+    imprimir(ruta, latencias, segundos)
+    imprimir(f"  /ping durante {ruta}", pings, segundos)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--peticiones", type=int, default=500)
+    parser.add_argument("--concurrencia", type=int, default=20)
+    parser.add_argument("--espera", type=float, default=0.01, help="segundos de pg_sleep por consulta")
+    args = parser.parse_args()
+
+    app = crear_app(args.espera)
+    for ruta in ("/bloqueante", "/executor"):
+        asyncio.run(escenario(app, ruta, args.peticiones, args.concurrencia))
+
+
+if __name__ == "__main__":
+    main()
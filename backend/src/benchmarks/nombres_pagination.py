@@ -0,0 +1,107 @@
+# backend\src\benchmarks\nombres_pagination.py
+
+"""
+Benchmark de `/pacientes/nombres` paginado por keyset según crece la tabla (contra BD).
+
+Para cada tamaño de `--tamanos` completa `n_pacientes` hasta ese número de
+filas `bench_*` y mide `PacienteService.get_paciente_names_page` en la
+primera página, en una a mitad de tabla y en la última (a partir de la
+clave que llevaría el cursor de la página anterior). Como referencia mide
+también la misma página con OFFSET y, hasta `--max-completo` filas, el
+listado completo (`get_all_paciente_names`). Las filas `bench_*` se borran
+al terminar salvo con `--conservar`.
+
+    python -m benchmarks.nombres_pagination --tamanos 10000,100000,1000000
+"""
+
+import argparse
+from typing import Any, Callable
+
+from sqlalchemy import text
+from sqlmodel import delete, func, insert, select
+
+from applications.pacientes.controller import PacienteService
+from applications.pacientes.models import Pacientes
+from core.manager_db_sync import SessionLocal, init_db
+
+from ._common import imprimir, logger, medir
+
+
+PREFIJO = "bench_"
+
+
+def completar(hasta: int, lote: int = 10000) -> None:
+    """Inserta filas `bench_*` hasta tener `hasta` en la tabla."""
+    with SessionLocal() as session:
+        existentes = session.exec(
+            select(func.count()).select_from(Pacientes).where(Pacientes.username.like(f"{PREFIJO}%"))
+        ).one()
+        for start in range(existentes, hasta, lote):
+            filas = [{"username": f"{PREFIJO}{i:09d}"} for i in range(start, min(start + lote, hasta))]
+            session.execute(insert(Pacientes), filas)
+            session.commit()
+        if session.bind.dialect.name == "postgresql":
+            session.execute(text("ANALYZE n_pacientes"))
+            session.commit()
+
+
+def clave_en(posicion: int) -> int:
+    """`id` de la fila en `posicion` (orden por id): la clave del cursor que llegaría ahí."""
+    with SessionLocal() as session:
+        return session.exec(select(Pacientes.id).order_by(Pacientes.id).offset(posicion).limit(1)).one()
+
+
+def pagina_keyset(after, limit: int) -> None:
+    with SessionLocal() as session:
+        PacienteService(session, logger).get_paciente_names_page(limit, after, "id")
+
+
+def pagina_offset(offset: int, limit: int) -> None:
+    with SessionLocal() as session:
+        session.exec(
+            select(Pacientes.id, Pacientes.username).order_by(Pacientes.id).offset(offset).limit(limit)
+        ).all()
+
+
+def listado_completo() -> None:
+    with SessionLocal() as session:
+        PacienteService(session, logger).get_all_paciente_names()
+
+
+def secuencial(nombre: str, func: Callable[[], Any], repeticiones: int) -> None:
+    latencias = medir(func, repeticiones)
+    imprimir(nombre, latencias, sum(latencias) / 1000)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanos", default="10000,100000,1000000")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeticiones", type=int, default=200)
+    parser.add_argument("--max-completo", type=int, default=100000)
+    parser.add_argument("--conservar", action="store_true")
+    args = parser.parse_args()
+
+    init_db(logger)
+    try:
+        for tamano in (int(t) for t in args.tamanos.split(",")):
+            completar(tamano)
+            with SessionLocal() as session:
+                total = session.exec(select(func.count()).select_from(Pacientes)).one()
+            print(f"--- {total} pacientes")
+
+            for nombre, posicion in (("primera", None), ("mitad", total // 2), ("ultima", total - args.limit)):
+                after = clave_en(posicion - 1) if posicion is not None else None
+                secuencial(f"keyset {nombre}", lambda: pagina_keyset(after, args.limit), args.repeticiones)
+                secuencial(f"offset {nombre}", lambda: pagina_offset(posicion or 0, args.limit), args.repeticiones)
+            if total <= args.max_completo:
+                secuencial("listado completo", listado_completo, max(args.repeticiones // 20, 3))
+    finally:
+        if not args.conservar:
+            with SessionLocal() as session:
+                session.exec(delete(Pacientes).where(Pacientes.username.like(f"{PREFIJO}%")))
+                session.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# backend\src\benchmarks\pool_sizing.py
+
+"""
+Benchmark de carga del engine asíncrono con distintos tamaños de pool (contra BD).
+
+Para cada combinación `pool_size:max_overflow` de `--pools` crea un engine
+como el de `manager_db_async` (mismo `DB_POOL_TIMEOUT` y `DB_POOL_RECYCLE`)
+y lanza `--peticiones` consultas con `--concurrencia` en vuelo. Cada consulta
+abre su propia sesión y ejecuta `SELECT pg_sleep(--espera)`, que simula el
+tiempo de una consulta real; con `--espera 0` ejecuta `SELECT 1`.
+
+    python -m benchmarks.pool_sizing --pools 5:0,10:5,20:10,40:10 --concurrencia 100
+"""
+
+import argparse
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.settings import settings
+
+from ._common import carga, imprimir
+
+
+async def escenario(pool_size: int, max_overflow: int, peticiones: int, concurrencia: int, espera: float) -> None:
+    engine = create_async_engine(
+        url=settings.SQLALCHEMY_DATABASE_URI_ASYNC,
+        pool_pre_ping=True,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    consulta = text("SELECT pg_sleep(:s)").bindparams(s=espera) if espera > 0 else text("SELECT 1")
+
+    async def peticion():
+        async with factory() as session:
+            await session.exec(consulta)
+
+    try:
+        await carga(peticion, min(peticiones, pool_size + max_overflow), concurrencia)  # abre las conexiones
+        latencias, segundos = await carga(peticion, peticiones, concurrencia)
+    finally:
+        await engine.dispose()
+    imprimir(f"pool_size={pool_size} max_overflow={max_overflow}", latencias, segundos)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pools", default=f"5:0,{settings.DB_POOL_SIZE}:{settings.DB_MAX_OVERFLOW},20:10")
+    parser.add_argument("--peticiones", type=int, default=2000)
+    parser.add_argument("--concurrencia", type=int, default=100)
+    parser.add_argument("--espera", type=float, default=0.005, help="segundos de pg_sleep por consulta")
+    args = parser.parse_args()
+
+    for pool in args.pools.split(","):
+        pool_size, max_overflow = (int(v) for v in pool.split(":"))
+        asyncio.run(escenario(pool_size, max_overflow, args.peticiones, args.concurrencia, args.espera))
+
+
+if __name__ == "__main__":
+    main()
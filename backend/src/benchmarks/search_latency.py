@@ -0,0 +1,131 @@
+# backend\src\benchmarks\search_latency.py
+
+"""
+Benchmark de latencia de `/pacientes/search` (pg_trgm) con la tabla llena (contra Postgres).
+
+Completa `n_pacientes` hasta `--pacientes` filas sintéticas (nombre y dos
+apellidos de unas listas fijas más un sufijo ` bench_<n>` que las hace únicas) y
+mide `PacienteService.search_pacientes` para cada búsqueda de `--consultas`:
+prefijos cortos y largos y una con una errata. Indica también si el plan de
+Postgres usa el índice `ix_n_pacientes_username_trgm`. Al terminar se borran,
+por id, las filas que ha insertado esta ejecución, salvo con `--conservar`
+(las conservadas se reutilizan en la siguiente, que tampoco las borra).
+
+El sufijo va en minúsculas: `normalize_text` pasa a mayúsculas, así que
+ningún paciente real puede tenerlo.
+
+    python -m benchmarks.search_latency --pacientes 1000000
+"""
+
+import argparse
+from typing import List
+
+from sqlalchemy import event, text
+from sqlmodel import delete, func, select
+
+from applications.pacientes.controller import PacienteService
+from applications.pacientes.models import Pacientes
+from core.manager_db_sync import SessionLocal, engine, init_db
+
+from ._common import imprimir, logger, medir
+
+
+NOMBRES = ["ANA", "JUAN", "MARIA", "JOSE", "LUCIA", "CARLOS", "CARMEN", "PABLO", "ELENA", "JAVIER",
+           "LAURA", "DAVID", "SARA", "MIGUEL", "PAULA", "ANTONIO", "MARTA", "MANUEL", "ISABEL", "RAUL"]
+APELLIDOS = ["GARCIA", "RODRIGUEZ", "GONZALEZ", "FERNANDEZ", "LOPEZ", "MARTINEZ", "SANCHEZ", "PEREZ",
+             "GOMEZ", "MARTIN", "JIMENEZ", "RUIZ", "HERNANDEZ", "DIAZ", "MORENO", "MUNOZ", "ALVAREZ",
+             "ROMERO", "ALONSO", "GUTIERREZ", "NAVARRO", "TORRES", "DOMINGUEZ", "VAZQUEZ", "RAMOS"]
+SUFIJO = " bench_"
+
+SINTETICOS = text(r"username ~ ' bench_[0-9]+$'")
+
+SEMBRAR = text(
+    """
+    INSERT INTO n_pacientes (username)
+    SELECT (:nombres)[1 + g % cardinality(:nombres)]
+           || ' ' || (:apellidos)[1 + (g / cardinality(:nombres)) % cardinality(:apellidos)]
+           || ' ' || (:apellidos)[1 + (g / 7) % cardinality(:apellidos)]
+           || :sufijo || g
+    FROM generate_series(:desde, :hasta - 1) AS g
+    ON CONFLICT (username) DO NOTHING
+    RETURNING id
+    """
+)
+
+
+def completar(hasta: int, creados: List[int]) -> int:
+    """
+    Inserta sintéticos hasta tener `hasta` y añade sus ids a `creados`.
+    Devuelve el total de pacientes.
+    """
+    with SessionLocal() as session:
+        existentes = session.exec(select(func.count()).select_from(Pacientes).where(SINTETICOS)).one()
+        if existentes < hasta:
+            ids = session.execute(SEMBRAR, {
+                "nombres": NOMBRES,
+                "apellidos": APELLIDOS,
+                "sufijo": SUFIJO,
+                "desde": existentes,
+                "hasta": hasta,
+            }).scalars().all()
+            session.commit()
+            creados.extend(ids)
+            session.execute(text("ANALYZE n_pacientes"))
+            session.commit()
+        return session.exec(select(func.count()).select_from(Pacientes)).one()
+
+
+def usa_indice(q: str, limit: int) -> bool:
+    """Si el plan de la búsqueda de `q` pasa por el índice trigram."""
+    capturadas = []
+
+    def capturar(conn, cursor, statement, parameters, context, executemany):
+        if "similarity" in statement:
+            capturadas.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capturar)
+    try:
+        buscar(q, limit)
+    finally:
+        event.remove(engine, "before_cursor_execute", capturar)
+    if not capturadas:
+        return False  # búsqueda vacía tras normalizar: no llega a la BD
+
+    statement, parameters = capturadas[0]
+    with engine.connect() as conn:
+        plan = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).scalars().all()
+    return any("ix_n_pacientes_username_trgm" in linea for linea in plan)
+
+
+def buscar(q: str, limit: int) -> None:
+    with SessionLocal() as session:
+        PacienteService(session, logger).search_pacientes(q, limit)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pacientes", type=int, default=1000000)
+    parser.add_argument("--consultas", default="ju,juan gar,maria lopez mar,carmen ruiz,javeir martniez")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--repeticiones", type=int, default=100)
+    parser.add_argument("--conservar", action="store_true")
+    args = parser.parse_args()
+
+    init_db(logger)
+    creados: List[int] = []
+    try:
+        print(f"--- {completar(args.pacientes, creados)} pacientes")
+        for q in args.consultas.split(","):
+            latencias = medir(lambda: buscar(q, args.limit), args.repeticiones)
+            indice = "índice trgm" if usa_indice(q, args.limit) else "SIN índice trgm"
+            imprimir(f"{q!r} ({indice})", latencias, sum(latencias) / 1000)
+    finally:
+        if not args.conservar:
+            with SessionLocal() as session:
+                for start in range(0, len(creados), 10000):
+                    session.exec(delete(Pacientes).where(Pacientes.id.in_(creados[start:start + 10000])))
+                session.commit()
+
+
+if __name__ == "__main__":
+    main()
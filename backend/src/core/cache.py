@@ -0,0 +1,109 @@
+# backend\src\core\cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .settings import settings
+
+
+class TTLCache:
+    """
+    Caché LRU acotada en memoria de proceso con caducidad por entrada.
+
+    - Cada entrada caduca en `min(ahora + ttl, expires_at)`.
+    - Al superar `maxsize` se descarta la entrada usada hace más tiempo.
+    - Lleva contadores de aciertos/fallos para medir su efecto.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = item
+            if expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, expires_at: Optional[float] = None) -> None:
+        """
+        Guarda `value` bajo `key`. `expires_at` (epoch en segundos) acota la
+        vida de la entrada por debajo del TTL de la caché.
+        """
+        if self.maxsize <= 0:
+            return
+
+        deadline = time.time() + self.ttl
+        if expires_at is not None:
+            deadline = min(deadline, expires_at)
+
+        with self._lock:
+            self._data[key] = (deadline, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def invalidate_where(self, predicate: Callable[[Any], bool]) -> int:
+        """Elimina las entradas cuyo valor cumple `predicate` y devuelve cuántas."""
+        with self._lock:
+            keys = [key for key, (_, value) in self._data.items() if predicate(value)]
+            for key in keys:
+                del self._data[key]
+        return len(keys)
+
+    def purge_expired(self) -> int:
+        """Elimina las entradas caducadas y devuelve cuántas se han borrado."""
+        now = time.time()
+        with self._lock:
+            expired = [key for key, (expires_at, _) in self._data.items() if expires_at <= now]
+            for key in expired:
+                del self._data[key]
+        return len(expired)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size = len(self._data)
+        total = self.hits + self.misses
+        return {
+            "size": size,
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.hits / total) if total else 0.0,
+        }
+
+
+# Sesiones validadas, indexadas por el `sub` del JWT. Guardan el rol: los cambios
+# de rol o bajas de este proceso la invalidan (`invalidate_user_sessions`), pero
+# los hechos en otro worker o directamente en BD tardan hasta
+# `SESSION_CACHE_TTL_SECONDS` en aplicarse (`SESSION_CACHE_MAXSIZE=0` la desactiva).
+session_cache = TTLCache(
+    maxsize=settings.SESSION_CACHE_MAXSIZE,
+    ttl=settings.SESSION_CACHE_TTL_SECONDS,
+)
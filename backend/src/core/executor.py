@@ -0,0 +1,70 @@
+# backend\src\core\executor.py
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from .settings import settings
+
+
+T = TypeVar("T")
+
+
+def _db_executor_workers() -> int:
+    # Por defecto, un hilo por conexión que puede entregar el pool del engine síncrono.
+    #
+    # Esto solo es seguro si ninguna petición retiene una conexión mientras espera
+    # hilo: cada llamada a `run_in_db_thread` debe terminar con la transacción
+    # cerrada (commit, rollback o `LazySession.release`/`call_and_release`) si la
+    # petición va a hacer otra después. Si no, todos los hilos pueden quedar
+    # bloqueados en el pool esperando conexiones de corrutinas que a su vez
+    # esperan hilo, hasta `DB_POOL_TIMEOUT`. Lo que retiene una conexión durante
+    # varias llamadas o minutos (streams, exportaciones, importaciones) va a `export_executor`.
+    return settings.DB_EXECUTOR_WORKERS or (settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW)
+
+
+# Pool de hilos dedicado a los servicios síncronos que usan la BD, separado
+# del pool por defecto de AnyIO/Starlette que comparten el resto de tareas.
+db_executor = ThreadPoolExecutor(
+    max_workers=_db_executor_workers(),
+    thread_name_prefix="db",
+)
+
+
+# Exportaciones e importaciones (minutos con una conexión abierta): hilos aparte para que no
+# dejen sin hilos a las peticiones normales de `db_executor`.
+export_executor = ThreadPoolExecutor(
+    max_workers=settings.EXPORT_WORKERS,
+    thread_name_prefix="export",
+)
+
+
+async def _run_in(executor: ThreadPoolExecutor, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, func, *args, **kwargs)
+    future = loop.run_in_executor(executor, call)
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        await asyncio.wait({future})
+        raise
+
+
+async def run_in_db_thread(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Ejecuta `func` (bloqueante, SQLAlchemy síncrono) en `db_executor` sin
+    bloquear el event loop. Propaga las context vars de la petición al hilo.
+
+    Si se cancela la petición, espera igualmente a que el hilo termine (lo
+    acota `statement_timeout`) antes de propagar la cancelación, para que la
+    sesión no se cierre mientras el hilo aún la está usando.
+    """
+    return await _run_in(db_executor, func, *args, **kwargs)
+
+
+async def run_in_export_thread(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Como `run_in_db_thread`, pero en `export_executor`."""
+    return await _run_in(export_executor, func, *args, **kwargs)
@@ -0,0 +1,222 @@
+# backend\src\core\export.py
+
+import csv
+import io
+import logging
+import os
+import tempfile
+import threading
+import weakref
+from http import HTTPStatus
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, Literal, Sequence
+
+from fastapi import HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
+from openpyxl import Workbook
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.sql import Select
+from starlette.background import BackgroundTask
+
+from .executor import run_in_export_thread
+from .settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+ExportFormat = Literal["csv", "xlsx"]
+
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+class _Slot:
+    def __init__(self, semaphore: threading.BoundedSemaphore):
+        self._semaphore = semaphore
+        self._lock = threading.Lock()
+        self._released = False
+
+    def release(self) -> None:
+        # Idempotente: lo llaman el `finally` del stream y, si el stream no
+        # llega a arrancar, el finalizador del generador.
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self._semaphore.release()
+
+
+class ExportSlots:
+    """
+    Limita las exportaciones, streams e importaciones en curso del proceso.
+    Cada uno retiene una conexión del pool durante minutos: sin límite, unos
+    pocos clientes dejarían sin conexiones al resto de endpoints.
+    """
+
+    def __init__(self, limit: int):
+        self._semaphore = threading.BoundedSemaphore(limit)
+
+    def acquire(self) -> _Slot:
+        if not self._semaphore.acquire(blocking=False):
+            raise HTTPException(
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                detail="Demasiadas exportaciones o importaciones en curso. Inténtelo más tarde.",
+            )
+        return _Slot(self._semaphore)
+
+
+export_slots = ExportSlots(settings.EXPORT_WORKERS)
+
+
+def stream_from_session(
+    factory: sessionmaker,
+    make_chunks: Callable[[Session], Iterator[bytes]],
+    name: str,
+) -> AsyncIterator[bytes]:
+    """
+    Cuerpo de un `StreamingResponse` que lee de su propia sesión en
+    `export_executor`, dentro de un hueco de `export_slots` (503 si no lo hay).
+    La sesión se abre al empezar a enviar y se cierra, con el hueco, al terminar.
+    """
+    slot = export_slots.acquire()
+
+    async def body():
+        session = None
+        chunks = None
+        try:
+            session = factory()
+            chunks = make_chunks(session)
+            while True:
+                chunk = await run_in_export_thread(next, chunks, None)
+                if chunk is None:
+                    break
+                yield chunk
+        except SQLAlchemyError as db_err:
+            # Cabeceras ya enviadas: se corta la conexión para que el cliente
+            # no dé por buena una descarga incompleta.
+            logger.error("Stream %s interrumpido: %s", name, db_err, exc_info=True)
+            raise
+        finally:
+            if chunks is not None:
+                await run_in_export_thread(chunks.close)
+            if session is not None:
+                await run_in_export_thread(session.close)
+            slot.release()
+
+    stream = body()
+    weakref.finalize(stream, slot.release)
+    return stream
+
+
+def _iter_rows(session, statement: Select, batch_size: int) -> Iterator[Sequence[Any]]:
+    # yield_per: cursor de servidor, la consulta no se materializa en memoria.
+    result = session.execute(statement.execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        yield from partition
+
+
+# Un texto que empieza por uno de estos caracteres lo interpreta Excel como fórmula.
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _safe_cell(value: Any) -> Any:
+    """Neutraliza la inyección de fórmulas (CSV/xlsx) anteponiendo `'` al texto."""
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def csv_chunks(rows: Iterable[Sequence[Any]], columns: Sequence[str], rows_per_chunk: int) -> Iterator[bytes]:
+    """CSV (UTF-8 con BOM, para Excel) en bloques de `rows_per_chunk` filas."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")
+    writer.writerow(columns)
+    pending = 0
+    for row in rows:
+        writer.writerow([_safe_cell(value) for value in row])
+        pending += 1
+        if pending >= rows_per_chunk:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue().encode()
+
+
+def write_xlsx(rows: Iterable[Sequence[Any]], columns: Sequence[str], title: str) -> str:
+    """
+    Escribe las filas en un xlsx temporal y devuelve su ruta. El modo
+    `write_only` de openpyxl vuelca las filas a disco según llegan en lugar
+    de mantener la hoja en memoria.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=title[:31])
+    sheet.append(list(columns))
+    for row in rows:
+        # Excel no admite fechas con zona horaria.
+        sheet.append([
+            value.replace(tzinfo=None) if getattr(value, "tzinfo", None) is not None else _safe_cell(value)
+            for value in row
+        ])
+
+    fd, path = tempfile.mkstemp(prefix="export_", suffix=".xlsx")
+    os.close(fd)
+    try:
+        workbook.save(path)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+async def export_response(
+    factory: sessionmaker,
+    statement: Select,
+    columns: Sequence[str],
+    formato: ExportFormat,
+    filename: str,
+):
+    """
+    Respuesta de descarga con el resultado de `statement`, leído con un cursor
+    de servidor en `export_executor`:
+
+    - csv: streaming real, un bloque por lote del cursor.
+    - xlsx: el fichero se genera en disco (write_only) y se envía por bloques;
+      el temporal se borra al terminar la respuesta.
+
+    La sesión es propia de la exportación: las dependencias con `yield` se
+    cierran antes de enviar el cuerpo. Como mucho hay `EXPORT_WORKERS`
+    exportaciones a la vez (`export_slots`); el resto recibe 503.
+    """
+    batch_size = settings.EXPORT_BATCH_SIZE
+    headers = {"Content-Disposition": f'attachment; filename="{filename}.{formato}"'}
+
+    if formato == "xlsx":
+        def build() -> str:
+            with factory() as session:
+                return write_xlsx(_iter_rows(session, statement, batch_size), columns, filename)
+
+        slot = export_slots.acquire()
+        try:
+            path = await run_in_export_thread(build)
+        except SQLAlchemyError as db_err:
+            logger.error("Error al generar la exportación %s: %s", filename, db_err, exc_info=True)
+            raise HTTPException(
+                status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
+                detail="Error al generar la exportación."
+            )
+        finally:
+            slot.release()
+        return FileResponse(
+            path,
+            media_type=XLSX_MEDIA_TYPE,
+            headers=headers,
+            background=BackgroundTask(os.unlink, path),
+        )
+
+    body = stream_from_session(
+        factory,
+        lambda session: csv_chunks(_iter_rows(session, statement, batch_size), columns, batch_size),
+        filename,
+    )
+    return StreamingResponse(body, media_type="text/csv; charset=utf-8", headers=headers)
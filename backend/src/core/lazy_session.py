@@ -0,0 +1,75 @@
+# backend\src\core\lazy_session.py
+
+from typing import Any, Callable, Optional, TypeVar
+
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+class LazySession:
+    """
+    Proxy de `Session` para la dependencia `get_session`.
+
+    - No crea la sesión hasta el primer uso, así que las peticiones que no
+      consultan la BD (rechazadas antes, caché de auth, stubs) no la abren.
+    - `release()` devuelve la conexión al pool en cuanto termina un tramo de
+      solo lectura, sin esperar al final de la petición. La sesión sigue
+      siendo utilizable: el siguiente uso pide otra conexión.
+    """
+
+    def __init__(self, factory: Callable[[], Session]):
+        self._factory = factory
+        self._session: Optional[Session] = None
+
+    def __getattr__(self, name):
+        if self._session is None:
+            self._session = self._factory()
+        return getattr(self._session, name)
+
+    def _has_pending_changes(self) -> bool:
+        session = self._session
+        return bool(session.new or session.dirty or session.deleted)
+
+    def release(self) -> None:
+        """
+        Cierra la transacción en curso si no hay cambios pendientes. Los objetos
+        ya cargados quedan desligados pero conservan sus atributos.
+        """
+        if self._session is not None and self._session.in_transaction() and not self._has_pending_changes():
+            self._session.close()
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+T = TypeVar("T")
+
+
+def call_and_release(session: LazySession, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Llama a `func` y devuelve la conexión de `session` al pool en el mismo hilo.
+    Para usarlo dentro de `run_in_db_thread` cuando a la consulta le sigue otra
+    llamada al executor en la misma petición (ver `core.executor`).
+    """
+    try:
+        return func(*args, **kwargs)
+    finally:
+        session.release()
+
+
+class AsyncLazySession(LazySession):
+    """Versión de `LazySession` para `AsyncSession`."""
+
+    def __init__(self, factory: Callable[[], AsyncSession]):
+        super().__init__(factory)
+
+    async def release(self) -> None:
+        if self._session is not None and self._session.in_transaction() and not self._has_pending_changes():
+            await self._session.close()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
@@ -1,11 +1,16 @@
 # backend\src\core\manager_db_async.py
 
+import time
+from logging import Logger
 from sqlalchemy.ext.asyncio import create_async_engine
-from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.orm import sessionmaker
 
 
+from .lazy_session import AsyncLazySession
+from .metrics import TimedAsyncAdaptedQueuePool, instrument_engine
+from .query_stats import instrument_queries
+from .schema import SCHEMA_VERSION, ensure_schema
 from .settings import settings
 
 
@@ -13,36 +18,45 @@ from .settings import settings
 async_engine = create_async_engine(url=settings.SQLALCHEMY_DATABASE_URI_ASYNC,
                                     echo=False,
                                     pool_pre_ping=True,
-                                    pool_recycle=1800,  # Reciclar conexiones después de 30 minutos
-                                    # connect_args={"timeout": 30},  # Incrementa el tiempo de espera a 30 segundos
-                                    # poolclass=AsyncAdaptedQueuePool,  # O utiliza NullPool si quieres mantenerlas al mínimo
-                                    # pool_size=10,  # Número de conexiones persistentes en el pool
-                                    # max_overflow=5,  # Conexiones adicionales permitidas si el pool está lleno
-                                    # pool_timeout=30,  # Tiempo máximo de espera para obtener una conexión
+                                    poolclass=TimedAsyncAdaptedQueuePool,
+                                    pool_size=settings.DB_POOL_SIZE,
+                                    max_overflow=settings.DB_MAX_OVERFLOW,
+                                    pool_timeout=settings.DB_POOL_TIMEOUT,
+                                    pool_recycle=settings.DB_POOL_RECYCLE,
                                 )
 
+instrument_engine(async_engine, "async")
+instrument_queries(async_engine)
+
 async_session_backgroung = sessionmaker(
     bind=async_engine, class_=AsyncSession, expire_on_commit=False
 )
 
 
-async def init_db():
+async def init_db(logger: Logger):
     """Create the database tables"""
+    start = time.perf_counter()
     async with async_engine.begin() as conn:
         from applications.pacientes.models import Pacientes
         from core.models.sessions import Sessions
         from core.models.users import Users
 
-        await conn.run_sync(SQLModel.metadata.create_all)
+        applied = await conn.run_sync(ensure_schema)
+    logger.info(
+        "init_db (%s): %s en %.1f ms",
+        settings.DB_STARTUP_MODE,
+        f"esquema v{SCHEMA_VERSION} aplicado" if applied else "esquema al día, sin DDL",
+        (time.perf_counter() - start) * 1000,
+    )
 
 async def get_session() -> AsyncSession: # type: ignore
     """Dependency to provide the session object"""
-    async_session = sessionmaker(
-        bind=async_engine, class_=AsyncSession, expire_on_commit=False
-    )
-
-    async with async_session() as session:
+    # La conexión se pide al pool en la primera consulta, no al resolver la dependencia.
+    session = AsyncLazySession(async_session_backgroung)
+    try:
         yield session
+    finally:
+        await session.close()
 
 
 
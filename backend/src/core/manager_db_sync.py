@@ -1,39 +1,96 @@
 # backend\src\core\manager_db_sync.py
 
+import time
 from functools import wraps
-from sqlmodel import Session, SQLModel, create_engine
+from logging import Logger
+from fastapi import Request
+from sqlmodel import Session, create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool, NullPool, AsyncAdaptedQueuePool
-from typing import Generator
+from typing import Generator, Optional
 
 
+from .lazy_session import LazySession
+from .metrics import TimedQueuePool, instrument_engine
+from .query_stats import instrument_queries
+from .read_routing import reads_from_primary
+from .schema import SCHEMA_VERSION, ensure_schema
 from .settings import settings
 
 
 engine = create_engine(url=settings.SQLALCHEMY_DATABASE_URI,
                        echo=False,
                        pool_pre_ping=True,
-                       pool_recycle=1800,
-                    #    connect_args={"timeout": 30},  # Incrementa el tiempo de espera a 30 segundos
-                    #    poolclass=QueuePool,  # O utiliza NullPool si quieres mantenerlas al mínimo
-                    #    max_overflow=5,  # Conexiones adicionales permitidas si el pool está lleno
-                    #    pool_timeout=30,  # Tiempo máximo de espera para obtener una conexión
-                       
+                       poolclass=TimedQueuePool,
+                       pool_size=settings.DB_POOL_SIZE,
+                       max_overflow=settings.DB_MAX_OVERFLOW,
+                       pool_timeout=settings.DB_POOL_TIMEOUT,
+                       pool_recycle=settings.DB_POOL_RECYCLE,
                        )
 
+instrument_engine(engine, "sync")
+instrument_queries(engine)
+
 SessionLocal = sessionmaker(bind=engine, class_=Session, expire_on_commit=False)
 
-def init_db():
+# Réplica de solo lectura (opcional, DATASOURCE_REPLICA_FQDN)
+replica_engine = None
+ReplicaSessionLocal: Optional[sessionmaker] = None
+if settings.SQLALCHEMY_REPLICA_URI:
+    replica_engine = create_engine(url=settings.SQLALCHEMY_REPLICA_URI,
+                                   echo=False,
+                                   pool_pre_ping=True,
+                                   poolclass=TimedQueuePool,
+                                   pool_size=settings.DB_POOL_SIZE,
+                                   max_overflow=settings.DB_MAX_OVERFLOW,
+                                   pool_timeout=settings.DB_POOL_TIMEOUT,
+                                   pool_recycle=settings.DB_POOL_RECYCLE,
+                                   )
+    instrument_engine(replica_engine, "sync_replica")
+    instrument_queries(replica_engine)
+    ReplicaSessionLocal = sessionmaker(bind=replica_engine, class_=Session, expire_on_commit=False)
+
+def init_db(logger: Logger):
     from applications.pacientes.models import Pacientes
+    from applications.info_errores.models import Errores
     from core.models.sessions import Sessions
+    from core.models.revoked_sessions import RevokedSessions
     from core.models.users import Users
-        
+
+    start = time.perf_counter()
     with engine.begin() as conn:
-        SQLModel.metadata.create_all(conn)
+        applied = ensure_schema(conn)
+    logger.info(
+        "init_db (%s): %s en %.1f ms",
+        settings.DB_STARTUP_MODE,
+        f"esquema v{SCHEMA_VERSION} aplicado" if applied else "esquema al día, sin DDL",
+        (time.perf_counter() - start) * 1000,
+    )
 
 def get_session() -> Generator[Session, None, None]:
-    with SessionLocal() as session:
+    # La conexión se pide al pool en la primera consulta, no al resolver la dependencia.
+    session = LazySession(SessionLocal)
+    try:
+        yield session
+    finally:
+        session.close()
+
+def read_sessionmaker(request: Request) -> sessionmaker:
+    """
+    Factoría de sesiones de solo lectura: la réplica si está configurada,
+    salvo que el cliente acabe de escribir (read-your-writes).
+    """
+    if ReplicaSessionLocal is not None and not reads_from_primary(request):
+        return ReplicaSessionLocal
+    return SessionLocal
+
+def get_read_session(request: Request) -> Generator[Session, None, None]:
+    """Sesión para endpoints de solo lectura (ver `read_sessionmaker`)."""
+    session = LazySession(read_sessionmaker(request))
+    try:
         yield session
+    finally:
+        session.close()
 
 
 
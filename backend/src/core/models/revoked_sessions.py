@@ -0,0 +1,20 @@
+# backend\src\core\models\revoked_sessions.py
+
+from sqlalchemy import func
+from sqlmodel import SQLModel, Field, Column
+from datetime import datetime
+import sqlalchemy.dialects.postgresql as pg
+
+
+class RevokedSessions(SQLModel, table=True):
+    """
+    Modelo para la tabla sesiones_revocadas (lista de `sub` revocados).
+    """
+    __tablename__ = 'sesiones_revocadas'
+
+    token: str = Field(sa_column=Column(pg.VARCHAR(300), primary_key=True, nullable=False))
+    exp: datetime = Field(sa_column=Column(pg.TIMESTAMP(timezone=True), nullable=True))
+    revoked_at: datetime = Field(sa_column=Column(pg.TIMESTAMP(timezone=True), server_default=func.now(), nullable=False, index=True))
+
+    def __repr__(self) -> str:
+        return f"RevokedSessions(token='{self.token}', exp='{self.exp}')"
@@ -0,0 +1,40 @@
+# backend\src\core\read_routing.py
+
+from fastapi import Request
+
+from .settings import settings
+
+
+# Cookie/cabecera que fuerza las lecturas contra el primario (read-your-writes).
+READ_PRIMARY_MARKER = "X-Read-Primary"
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def reads_from_primary(request: Request) -> bool:
+    """
+    True si la petición debe leer del primario: el cliente acaba de escribir
+    (cookie puesta por `read_your_writes_middleware`) o lo pide con la cabecera.
+    """
+    return (
+        READ_PRIMARY_MARKER in request.cookies
+        or request.headers.get(READ_PRIMARY_MARKER) == "1"
+    )
+
+
+async def read_your_writes_middleware(request: Request, call_next):
+    """
+    Tras una escritura correcta marca al cliente durante `READ_YOUR_WRITES_SECONDS`
+    para que sus siguientes lecturas no vayan a una réplica todavía retrasada.
+    """
+    response = await call_next(request)
+    if request.method not in SAFE_METHODS and response.status_code < 400:
+        response.set_cookie(
+            key=READ_PRIMARY_MARKER,
+            value="1",
+            max_age=settings.READ_YOUR_WRITES_SECONDS,
+            httponly=True,
+            samesite="lax",
+            path="/"
+        )
+    return response
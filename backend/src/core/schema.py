@@ -0,0 +1,73 @@
+# backend\src\core\schema.py
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlmodel import SQLModel
+
+from .settings import settings
+
+
+# Súbelo al añadir o cambiar tablas/índices para que el siguiente arranque ejecute el DDL.
+SCHEMA_VERSION = 4
+
+# Clave de `pg_advisory_xact_lock` que serializa el DDL entre workers y réplicas.
+SCHEMA_LOCK_KEY = 7_401_202
+
+# Fila propia en `schema_versions`: cada aplicación que comparte la BD lleva su marca.
+SCHEMA_APP = "backend"
+
+
+def _schema_is_current(conn: Connection) -> bool:
+    if conn.execute(text("SELECT to_regclass('schema_versions')")).scalar() is None:
+        return False
+    version = conn.execute(
+        text("SELECT version FROM schema_versions WHERE app = :app"), {"app": SCHEMA_APP}
+    ).scalar()
+    # Una marca más nueva (despliegue escalonado) también vale: este código no la rebaja.
+    return version is not None and version >= SCHEMA_VERSION
+
+
+def ensure_schema(conn: Connection) -> bool:
+    """
+    Crea las tablas según `DB_STARTUP_MODE` y devuelve True si ha ejecutado DDL.
+
+    - auto: consulta la marca de la app en `schema_versions` y solo ejecuta
+      `create_all` si no está al día. El DDL va bajo un advisory lock de transacción, de modo que
+      con varios workers arrancando a la vez lo ejecuta uno y el resto lo salta.
+    - create_all: ejecuta siempre `create_all` (comportamiento anterior).
+    - skip: no toca el esquema.
+    """
+    mode = settings.DB_STARTUP_MODE
+    if mode == "skip":
+        return False
+    if mode == "auto" and _schema_is_current(conn):
+        return False
+
+    conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY})
+    if mode == "auto" and _schema_is_current(conn):
+        # Otro worker lo ha aplicado mientras esperábamos el lock.
+        return False
+
+    # Extensiones que usan los índices de los modelos (antes de crear tablas).
+    conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    SQLModel.metadata.create_all(conn)
+    # create_all no añade índices nuevos a tablas que ya existen.
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_versions ("
+        " app VARCHAR(64) PRIMARY KEY,"
+        " version INTEGER NOT NULL,"
+        " applied_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+    ))
+    conn.execute(
+        text(
+            "INSERT INTO schema_versions (app, version) VALUES (:app, :version) "
+            "ON CONFLICT (app) DO UPDATE SET"
+            " version = GREATEST(schema_versions.version, EXCLUDED.version),"
+            " applied_at = now()"
+        ),
+        {"app": SCHEMA_APP, "version": SCHEMA_VERSION},
+    )
+    return True
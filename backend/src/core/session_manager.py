@@ -1,11 +1,16 @@
 # src\core\session_manager.py
 
-from datetime import datetime, timezone
-from sqlalchemy import delete
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.dialects.postgresql import insert
 from sqlmodel import Session
 from logging import Logger
+from typing import Any, Dict, Optional
 
-from .models.sessions import Sessions
+from .cache import session_cache
+from .models.revoked_sessions import RevokedSessions
+from .revocation import revocation_list
+from .session_store import get_session_store, purge_expired_rows
+from .settings import settings
 from .token_utils import get_uuid_and_exp_from_token
 
 
@@ -14,28 +19,109 @@ class SessionManager:
     def __init__(self, session: Session,  logger: Logger):
         self.session = session
         self.logger = logger
+        self.store = get_session_store(session)
 
-    def create_session(self, username: str, token: str) -> Sessions:
+    def get_session(self, uuid: str) -> Optional[Dict[str, Any]]:
+        """Devuelve `{"usu", "exp", "role"}` de la sesión o None si no existe."""
+        return self.store.get(uuid)
+
+    def create_session(self, username: str, token: str, role: Optional[str] = None) -> None:
         try:
             uuid, exp = get_uuid_and_exp_from_token(token)
 
-            nueva_sesion = Sessions(token=uuid, usu=username, exp=exp)
-            self.session.add(nueva_sesion)
-            self.session.commit()
-            self.session.refresh(nueva_sesion)
-
-            return nueva_sesion
+            self.store.create(uuid, username, exp, role)
+            session_cache.invalidate(uuid)
         except Exception as e:
+            self.session.rollback()
             self.logger.error("Error al crear sesión: %s", e, exc_info=True)
             raise
         
-    def purge_expired_sessions(self) -> None:
-        """Elimina todas las sesiones caducadas (exp < ahora UTC)."""
+    def renew_session(self, uuid: str, exp: datetime, renew_if_before: datetime) -> bool:
+        """
+        Renovación deslizante: amplía la sesión hasta `exp` si aún no lo ha hecho
+        otro proceso y actualiza la entrada de la caché de sesiones validadas.
+
+        :return: False si la sesión ya no existe (revocada o purgada): en ese
+                 caso no debe emitirse una cookie renovada.
+        """
         try:
-            stmt = delete(Sessions).where(Sessions.exp < datetime.now(timezone.utc))
-            result = self.session.exec(stmt)
-            self.session.commit()
-            self.logger.info("Sesiones caducadas eliminadas: %d", result.rowcount)
+            renewed = self.store.renew(uuid, exp, renew_if_before)
+            if not renewed and self.store.get(uuid) is None:
+                session_cache.invalidate(uuid)
+                return False
+            cached = session_cache.get(uuid)
+            if cached is not None:
+                session_cache.set(uuid, dict(cached, exp=exp), expires_at=exp.timestamp())
+            return True
+        except Exception as e:
+            self.session.rollback()
+            self.logger.error("Error al renovar sesión: %s", e, exc_info=True)
+            raise
+
+    def invalidate_user_sessions(self, username: str) -> int:
+        """
+        Olvida las sesiones validadas en caché de `username`. Llamar tras cambiar
+        su rol o darlo de baja, para que la siguiente petición relea el rol.
+        """
+        return session_cache.invalidate_where(lambda cached: cached.get("usu") == username)
+
+    def purge_expired_sessions(self, batch_size: int = 1000) -> int:
+        """
+        Elimina las sesiones caducadas (exp < ahora UTC) en lotes de `batch_size`.
+
+        :return: Número total de sesiones eliminadas.
+        """
+        try:
+            total = self.store.purge_expired(batch_size)
+            session_cache.purge_expired()
+            return total
         except Exception as e:
+            self.session.rollback()
             self.logger.error("Error al purgar sesiones caducadas: %s", e, exc_info=True)
+            raise
+
+    def purge_expired_revocations(self, batch_size: int = 1000) -> int:
+        """
+        Elimina de `sesiones_revocadas` los `sub` cuyo token ya ha caducado.
+
+        :return: Número total de revocaciones eliminadas.
+        """
+        try:
+            return purge_expired_rows(self.session, RevokedSessions, batch_size)
+        except Exception as e:
+            self.session.rollback()
+            self.logger.error("Error al purgar sesiones revocadas: %s", e, exc_info=True)
+            raise
+
+    def revoke_session(self, uuid: str, exp: Optional[datetime] = None) -> None:
+        """
+        Revoca una sesión concreta (por el `sub` del JWT).
+
+        Además de borrarla del almacén de sesiones, la registra en
+        `sesiones_revocadas` para que los tokens validados sin estado también
+        queden invalidados.
+
+        La revocación dura al menos `TOKEN_SECONDS_EXP` (más un ciclo de
+        refresco de la lista) desde ahora, no solo hasta el `exp` del token
+        presentado: una renovación en curso, o en otro worker que aún no la
+        conoce, puede emitir un token con el mismo `sub` y un `exp` posterior.
+        """
+        if exp is not None:
+            horizon = datetime.now(timezone.utc) + timedelta(
+                seconds=settings.TOKEN_SECONDS_EXP + settings.REVOCATION_REFRESH_SECONDS
+            )
+            exp = max(exp, horizon)
+        try:
+            self.store.delete(uuid)
+            self.session.exec(
+                insert(RevokedSessions)
+                .values(token=uuid, exp=exp)
+                .on_conflict_do_nothing(index_elements=["token"])
+            )
+            self.session.commit()
+            session_cache.invalidate(uuid)
+            revocation_list.add(uuid, exp)
+        except Exception as e:
+            self.session.rollback()
+            self.logger.error("Error al revocar sesión: %s", e, exc_info=True)
             raise
\ No newline at end of file
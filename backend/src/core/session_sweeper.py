@@ -0,0 +1,37 @@
+# backend\src\core\session_sweeper.py
+
+import asyncio
+import time
+from logging import Logger
+
+from .settings import settings
+from .manager_db_sync import SessionLocal
+from .session_manager import SessionManager
+
+
+def sweep_expired_sessions(logger: Logger) -> int:
+    """
+    Ejecuta una pasada de purga de sesiones (y revocaciones) caducadas con su propia sesión de BD.
+    Registra las filas eliminadas y la duración de la pasada.
+    """
+    start = time.perf_counter()
+    with SessionLocal() as session:
+        manager = SessionManager(session, logger)
+        deleted = manager.purge_expired_sessions(batch_size=settings.SESSION_SWEEP_BATCH_SIZE)
+        deleted += manager.purge_expired_revocations(batch_size=settings.SESSION_SWEEP_BATCH_SIZE)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    logger.info("Barrido de sesiones: %d caducadas eliminadas en %.1f ms", deleted, elapsed_ms)
+    return deleted
+
+
+async def run_session_sweeper(logger: Logger) -> None:
+    """
+    Bucle periódico que purga las sesiones caducadas fuera del camino de las
+    peticiones. Se lanza como tarea desde el `lifespan` de la aplicación.
+    """
+    while True:
+        try:
+            await asyncio.to_thread(sweep_expired_sessions, logger)
+        except Exception as e:
+            logger.error("Error en el barrido de sesiones: %s", e, exc_info=True)
+        await asyncio.sleep(settings.SESSION_SWEEP_INTERVAL_SECONDS)
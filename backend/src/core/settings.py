@@ -1,7 +1,7 @@
 # src\core\settings.py
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Annotated, Any, Literal
+from typing import Annotated, Any, Literal, Optional
 from pydantic import (
     AnyUrl,
     BeforeValidator,
@@ -39,6 +39,38 @@ class Settings(BaseSettings):
     TOKEN_SECONDS_EXP: int
     API_KEY: str
 
+    # session: valida cada petición contra la tabla `sesiones` (por defecto).
+    # stateless: valida solo la firma del JWT y una lista de revocados en memoria.
+    AUTH_MODE: Literal["session", "stateless"] = "session"
+    REVOCATION_REFRESH_SECONDS: float = 10
+
+    HASH_POOL_WORKERS: int = 2
+    HASH_POOL_MAX_QUEUE: int = 16  # operaciones en espera antes de responder 503
+
+    TOKEN_CACHE_ENABLED: bool = True
+    TOKEN_CACHE_MAXSIZE: int = 10000
+
+    # sql: tabla `sesiones` (por defecto) | memory: dict del proceso (un solo worker)
+    # redis: cualquier servidor con protocolo Redis en REDIS_URL
+    SESSION_STORE: Literal["sql", "memory", "redis"] = "sql"
+    REDIS_URL: str = "redis://localhost:6379/0"
+    REDIS_SESSION_PREFIX: str = "sesion:"
+
+    # Renovación deslizante: se renueva al superar esta fracción de la vida del token.
+    SESSION_SLIDING_ENABLED: bool = True
+    SESSION_RENEW_FRACTION: float = 0.5
+
+    # Plazo máximo de cada petición HTTP (504 al agotarse); <= 0 lo desactiva.
+    # Se traslada a `statement_timeout` en las transacciones de la petición.
+    REQUEST_TIMEOUT_SECONDS: float = 30
+
+    SESSION_CACHE_MAXSIZE: int = 10000
+    # También es el retraso máximo con que se aplica un cambio de rol o una baja
+    # hechos en otro worker o directamente en BD.
+    SESSION_CACHE_TTL_SECONDS: float = 30
+    SESSION_SWEEP_INTERVAL_SECONDS: float = 300  # <= 0 desactiva el barrido
+    SESSION_SWEEP_BATCH_SIZE: int = 1000
+
     DATASOURCE_DB: str
     DATASOURCE_PORT: int
     DATASOURCE_FQDN: str
@@ -47,6 +79,39 @@ class Settings(BaseSettings):
     DATASOURCE_SCHEMA_SYNC: str
     DATASOURCE_SCHEMA_ASYNC: str
 
+    # Pool de conexiones de cada engine (por proceso)
+    DB_POOL_SIZE: int = 10  # conexiones persistentes
+    DB_MAX_OVERFLOW: int = 5  # conexiones extra si el pool está lleno
+    DB_POOL_TIMEOUT: float = 30  # segundos de espera máxima por una conexión
+    DB_POOL_RECYCLE: int = 1800  # reciclar conexiones después de 30 minutos
+    DB_EXECUTOR_WORKERS: int = 0  # hilos para servicios síncronos; 0 = DB_POOL_SIZE + DB_MAX_OVERFLOW
+    # Exportaciones, streams e importaciones simultáneos por proceso (503 al superarlo). Cada uno
+    # retiene una conexión del pool mientras dura; también son los hilos de export_executor.
+    EXPORT_WORKERS: int = 2
+    EXPORT_BATCH_SIZE: int = 2000  # filas por lote del cursor de servidor
+
+    SLOW_QUERY_MS: float = 200  # sentencias más lentas se registran en el log
+    QUERY_STATS_MAX_FINGERPRINTS: int = 500
+    QUERY_BUDGET_PER_REQUEST: int = 20  # aviso en el log si una petición lo supera
+    N_PLUS_ONE_THRESHOLD: int = 5  # aviso si una petición repite tantas veces la misma sentencia
+
+    # auto: DDL solo si la marca schema_versions de la app no está al día (bajo advisory lock)
+    # create_all: DDL en cada arranque | skip: nunca (migraciones externas)
+    DB_STARTUP_MODE: Literal["auto", "create_all", "skip"] = "auto"
+
+    # Índice en memoria de usernames para /pacientes/autocomplete
+    AUTOCOMPLETE_ENABLED: bool = True
+    AUTOCOMPLETE_REFRESH_SECONDS: float = 30  # cambios hechos por otros workers
+
+    PACIENTES_BULK_CHUNK_SIZE: int = 1000  # filas por INSERT (y por transacción) en /pacientes/bulk
+    PACIENTES_BULK_MAX_ROWS: int = 10000
+    PACIENTES_IMPORT_CHUNK_SIZE: int = 50000  # filas por COPY (y por transacción) en /pacientes/import
+
+    # Réplica de solo lectura opcional para los endpoints de consulta
+    DATASOURCE_REPLICA_FQDN: Optional[str] = None
+    DATASOURCE_REPLICA_PORT: Optional[int] = None  # por defecto DATASOURCE_PORT
+    READ_YOUR_WRITES_SECONDS: int = 5  # lecturas al primario tras una escritura
+
     ENVIRONMENT: Literal["local", "staging", "production"] = "local"
     
     BACKEND_CORS_ORIGINS: Annotated[
@@ -86,5 +151,29 @@ class Settings(BaseSettings):
             )
         )
 
+    def _replica_uri(self, scheme: str) -> Optional[str]:
+        if not self.DATASOURCE_REPLICA_FQDN:
+            return None
+        return str(
+            MultiHostUrl.build(
+                scheme=scheme,
+                username=self.DATASOURCE_USR,
+                password=self.DATASOURCE_PWD,
+                host=self.DATASOURCE_REPLICA_FQDN,
+                port=self.DATASOURCE_REPLICA_PORT or self.DATASOURCE_PORT,
+                path=self.DATASOURCE_DB,
+            )
+        )
+
+    @computed_field
+    @property
+    def SQLALCHEMY_REPLICA_URI(self) -> Optional[str]:
+        return self._replica_uri(self.DATASOURCE_SCHEMA_SYNC)
+
+    @computed_field
+    @property
+    def SQLALCHEMY_REPLICA_URI_ASYNC(self) -> Optional[str]:
+        return self._replica_uri(self.DATASOURCE_SCHEMA_ASYNC)
+
 
 settings = Settings()
\ No newline at end of file
@@ -2,42 +2,152 @@
 
 
 from datetime import datetime, timezone, timedelta
-from typing import Tuple
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+import hashlib
 import uuid
+from fastapi import Response
 from jose import jwt, JWTError
 
 from .settings import settings
+from .cache import TTLCache
 
+# Payloads de JWT ya verificados, indexados por el SHA-256 del token.
+token_cache = TTLCache(
+    maxsize=settings.TOKEN_CACHE_MAXSIZE,
+    ttl=settings.TOKEN_SECONDS_EXP,
+)
 
-def create_token() -> str:
+
+def create_token(
+    username: Optional[str] = None,
+    role: Optional[str] = None,
+    sub: Optional[str] = None,
+    expires_at: Optional[datetime] = None,
+) -> str:
     """
     Genera un JWT firmado y con expiración.
-    El 'sub' es un UUID aleatorio.
+    El 'sub' es un UUID aleatorio, salvo al renovar una sesión existente (`sub`).
+
+    Si se indican, `username` y `role` viajan como claims `usu` y `role`
+    para el modo de validación sin estado (`AUTH_MODE=stateless`).
     """
-    expires_at = datetime.now(timezone.utc) + timedelta(seconds=settings.TOKEN_SECONDS_EXP)
+    if expires_at is None:
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=settings.TOKEN_SECONDS_EXP)
 
     data_token = {
-        "sub": str(uuid.uuid4()),
+        "sub": sub or str(uuid.uuid4()),
         "exp": expires_at
         # (opcional) "iat": datetime.now(timezone.utc),
         # (opcional) "nbf": datetime.now(timezone.utc),
     }
+    if username is not None:
+        data_token["usu"] = username
+    if role is not None:
+        data_token["role"] = role
 
     return jwt.encode(data_token, settings.JWT_SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
+def set_auth_cookie(response: Response, token: str) -> None:
+    """Fija la cookie de autenticación `X-Sync.Ref` con el JWT."""
+    response.set_cookie(
+        key="X-Sync.Ref",
+        value=token,
+        max_age=settings.TOKEN_SECONDS_EXP,
+        httponly=True,
+        samesite="lax",
+        path="/"
+    )
+
+
+# Cookie renovada pendiente de la petición en curso. Es un dict mutable porque
+# el endpoint corre en tareas/hilos con una copia del contexto: se escribe en
+# el objeto, no se reasigna la variable.
+_pending_auth_cookie: ContextVar[Optional[Dict[str, str]]] = ContextVar("pending_auth_cookie", default=None)
+
+
+def can_defer_auth_cookie() -> bool:
+    """True si la petición en curso pasa por `AuthCookieMiddleware`."""
+    return _pending_auth_cookie.get() is not None
+
+
+def defer_auth_cookie(token: str) -> bool:
+    """
+    Programa la cookie `X-Sync.Ref` para la respuesta de la petición en curso,
+    sea cual sea el `Response` que acabe devolviendo el endpoint.
+    Devuelve False si `AuthCookieMiddleware` no está activo.
+    """
+    pending = _pending_auth_cookie.get()
+    if pending is None:
+        return False
+    pending["token"] = token
+    return True
+
+
+class AuthCookieMiddleware:
+    """
+    Middleware ASGI que añade a la respuesta la cookie programada con
+    `defer_auth_cookie`, salvo que el endpoint ya fije (o borre) `X-Sync.Ref`.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        pending: Dict[str, str] = {}
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and "token" in pending:
+                headers = list(message.get("headers") or [])
+                if not any(
+                    key.lower() == b"set-cookie" and value.startswith(b"X-Sync.Ref=")
+                    for key, value in headers
+                ):
+                    holder = Response()
+                    set_auth_cookie(holder, pending["token"])
+                    headers += [(key, value) for key, value in holder.raw_headers if key == b"set-cookie"]
+                    message = dict(message, headers=headers)
+            await send(message)
+
+        token = _pending_auth_cookie.set(pending)
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            _pending_auth_cookie.reset(token)
+
+
 def verify_token(token: str) -> dict:
     """
     Verifica y decodifica un JWT. Lanza ValueError si es inválido o ha expirado.
 
+    Los payloads ya verificados se guardan en una LRU acotada (clave: hash del
+    token) hasta su `exp`, para no repetir la verificación de firma en cada
+    petición con la misma cookie. Se desactiva con `TOKEN_CACHE_ENABLED=false`.
+
     :param token: JWT a verificar
     :return: Payload del token si es válido
     """
+    cache_key = None
+    if settings.TOKEN_CACHE_ENABLED:
+        cache_key = hashlib.sha256(token.encode()).digest()
+        payload = token_cache.get(cache_key)
+        if payload is not None:
+            return dict(payload)
+
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError as e:
         raise ValueError(f"Token inválido o expirado: {e}")
+
+    if cache_key is not None and isinstance(payload.get("exp"), (int, float)):
+        token_cache.set(cache_key, dict(payload), expires_at=payload["exp"])
+
+    return payload
     
     
 def get_uuid_and_exp_from_token(token: str) -> Tuple[str, datetime]:
@@ -1,11 +1,49 @@
 # backend\src\core\utils.py
 
+import base64
+import hashlib
+import json
 import re
 import unicodedata
+from typing import Any, Dict, Optional
 
 def normalize_text(text: str) -> str:
     text = unicodedata.normalize("NFKD", text)
     text = text.encode("ascii", "ignore").decode()
     text = text.casefold()         
     text = re.sub(r"\s+", " ", text).strip()
-    return text.upper()
\ No newline at end of file
+    return text.upper()
+
+
+def encode_cursor(data: Dict[str, Any]) -> str:
+    """Cursor opaco de paginación (JSON en base64 url-safe, sin relleno)."""
+    raw = json.dumps(data, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def make_etag(*parts: Any) -> str:
+    """ETag débil a partir de los valores que identifican una versión de la respuesta."""
+    digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True si la cabecera `If-None-Match` incluye `etag` (comparación débil)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Inverso de `encode_cursor`. Lanza ValueError si el cursor no es válido."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Cursor inválido") from e
+    if not isinstance(data, dict):
+        raise ValueError("Cursor inválido")
+    return data
\ No newline at end of file
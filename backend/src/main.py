@@ -1,5 +1,6 @@
 # backend\src\main.py
 
+import asyncio
 import uvicorn
 import logging
 from fastapi import FastAPI
@@ -9,9 +10,23 @@ from contextlib import asynccontextmanager
 try:
     from src.core.settings import settings
     from src.core.manager_db_sync import init_db
+    from src.core.session_sweeper import run_session_sweeper
+    from src.core.revocation import run_revocation_refresher
+    from src.core.read_routing import read_your_writes_middleware
+    from src.core.deadline import DeadlineMiddleware
+    from src.core.query_stats import QueryCounterMiddleware
+    from src.core.token_utils import AuthCookieMiddleware
+    from src.applications.pacientes.autocomplete import run_username_index_refresher
 except ImportError:
     from core.settings import settings
     from core.manager_db_sync import init_db
+    from core.session_sweeper import run_session_sweeper
+    from core.revocation import run_revocation_refresher
+    from core.read_routing import read_your_writes_middleware
+    from core.deadline import DeadlineMiddleware
+    from core.query_stats import QueryCounterMiddleware
+    from core.token_utils import AuthCookieMiddleware
+    from applications.pacientes.autocomplete import run_username_index_refresher
 
 
 def create_app() -> FastAPI: 
@@ -31,9 +46,22 @@ def create_app() -> FastAPI:
     @asynccontextmanager
     async def lifespan(app: FastAPI):
         logger.info("server is starting")
-        init_db()
+        init_db(logger)
+
+        sweeper = None
+        if settings.SESSION_SWEEP_INTERVAL_SECONDS > 0:
+            sweeper = asyncio.create_task(run_session_sweeper(logger))
+        refresher = asyncio.create_task(run_revocation_refresher(logger))
+        autocomplete = None
+        if settings.AUTOCOMPLETE_ENABLED:
+            autocomplete = asyncio.create_task(run_username_index_refresher(logger))
         yield 
         logger.info("server is shuttting down")
+        refresher.cancel()
+        if autocomplete is not None:
+            autocomplete.cancel()
+        if sweeper is not None:
+            sweeper.cancel()
 
     app = FastAPI(
         title="Nutricion service",
@@ -45,6 +73,9 @@ def create_app() -> FastAPI:
         lifespan=lifespan
     )
 
+    app.add_middleware(DeadlineMiddleware, timeout=settings.REQUEST_TIMEOUT_SECONDS)
+    app.add_middleware(QueryCounterMiddleware)
+
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -52,18 +83,29 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    # El más externo: también alcanza a las respuestas que genera otro middleware (504).
+    app.add_middleware(AuthCookieMiddleware)
+
+    if settings.SQLALCHEMY_REPLICA_URI:
+        app.middleware("http")(read_your_writes_middleware)
 
     app.state.logger = logger
 
     try:
         from src.applications.pacientes.router import paciente_router
         from src.applications.login.router import login_router
+        from src.applications.monitoring.router import monitoring_router
+        from src.applications.info_errores.router import info_errores_router
     except ImportError:
         from applications.pacientes.router import paciente_router
         from applications.login.router import login_router
+        from applications.monitoring.router import monitoring_router
+        from applications.info_errores.router import info_errores_router
         
     app.include_router(login_router)
     app.include_router(paciente_router)
+    app.include_router(monitoring_router)
+    app.include_router(info_errores_router)
 
 
     return app
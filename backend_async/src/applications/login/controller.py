@@ -3,18 +3,17 @@
 
 from sqlmodel import select
 from sqlmodel.ext.asyncio.session import AsyncSession
-from fastapi import HTTPException, Response, status, Depends
+from fastapi import HTTPException, Request, Response, status, Depends
 from fastapi.responses import JSONResponse
 from http import HTTPStatus
 from logging import Logger
 from typing import Optional
 
 
-from core.settings import settings
 from core.utils import normalize_text
 from core.session_manager import SessionManager
-from core.token_utils import create_token
-from werkzeug.security import generate_password_hash, check_password_hash
+from core.token_utils import create_token, get_uuid_and_exp_from_token, set_auth_cookie
+from core.hashing import password_hasher
 from core.models.users import Users
 
 
@@ -40,27 +39,35 @@ class LoginService:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Usuario no encontrado"
             )
+        # El hash de la contraseña es lento: no retener la conexión mientras tanto.
+        await self.session.release()
 
-        if not user.hash_pwd or not self.authenticate_user(user.hash_pwd, password):
+        if not user.hash_pwd or not await self.authenticate_user(user.hash_pwd, password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Contraseña incorrecta"
             )
 
-        access_token = create_token()
-        await self.session_manager.create_session(username_normalizado, access_token)
+        access_token = create_token(username=username_normalizado, role=user.role)
+        await self.session_manager.create_session(username_normalizado, access_token, role=user.role)
 
-        response.set_cookie(
-            key="X-Sync.Ref",
-            value=access_token,
-            max_age=settings.TOKEN_SECONDS_EXP,
-            httponly=True,
-            samesite="lax",
-            path="/"
-        )
+        set_auth_cookie(response, access_token)
 
         return {"message": "Login correcto"}
 
+    async def logout(self, request: Request, response: Response):
+        token_cookie = request.cookies.get("X-Sync.Ref")
+        if token_cookie:
+            try:
+                uuid_, exp = get_uuid_and_exp_from_token(token_cookie)
+                await self.session_manager.revoke_session(uuid_, exp)
+            except ValueError:
+                pass
+
+        response.delete_cookie(key="X-Sync.Ref", path="/")
+
+        return {"message": "Sesión cerrada"}
+
     async def get_user(self, username: str) -> Optional[Users]:
         try:
             stmt  = select(Users).where(Users.usu == username)
@@ -80,21 +87,26 @@ class LoginService:
                     status_code=HTTPStatus.CONFLICT,
                     content={"message": f"El usuario '{username_normalizado}' ya existe."}
                 )
+            await self.session.release()
 
-            hashed_pwd = generate_password_hash(password)
+            hashed_pwd = await password_hasher.generate(password)
             user = Users(usu=username_normalizado, hash_pwd=hashed_pwd, role=role)
 
             self.session.add(user)
             await self.session.commit()
             await self.session.refresh(user)
+            # Un usuario borrado y recreado con otro rol no debe heredar el de la caché.
+            self.session_manager.invalidate_user_sessions(user.usu)
 
             return JSONResponse(
                 status_code=HTTPStatus.CREATED,
                 content={"message": f"Usuario '{user.usu}' creado exitosamente."}
             )
+        except HTTPException:
+            raise
         except Exception as e:
             self.logger.error("Error al crear usuario: %s", e, exc_info=True)
             raise HTTPException(status_code=500, detail="Error interno al crear el usuario")
 
-    def authenticate_user(self, hashed_password: str, plain_password: str) -> bool:
-        return check_password_hash(hashed_password, plain_password)
\ No newline at end of file
+    async def authenticate_user(self, hashed_password: str, plain_password: str) -> bool:
+        return await password_hasher.check(hashed_password, plain_password)
\ No newline at end of file
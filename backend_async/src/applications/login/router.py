@@ -37,6 +37,18 @@ async def login(
     )
 
 
+@login_router.post("/logout")
+async def logout(
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_session)
+):
+    return await LoginService(session, request.app.state.logger).logout(
+        request=request,
+        response=response
+    )
+
+
 @login_router.post("/alta-usuario", dependencies=[Depends(require_secret)])
 async def create_user(
     user_data: UserCreateRequest,
@@ -8,7 +8,7 @@ from http import HTTPStatus
 from typing import Optional, List, Dict
 
 
-from core.manager_db_async import get_session
+from core.manager_db_async import get_read_session
 from core.security import require_secret, require_roles
 # from .controller import PacienteService
 from .schemas import (
@@ -29,7 +29,7 @@ reservas_router = APIRouter(
 
 
 @reservas_router.get("/nombres")
-async def get_paciente_names(request: Request, session: AsyncSession = Depends(get_session)):
+async def get_paciente_names(request: Request, session: AsyncSession = Depends(get_read_session)):
     """
     Endpoint para obtener la lista de nombres de todos los pacientes.
 
@@ -0,0 +1,181 @@
+# backend\src\core\deadline.py
+
+import asyncio
+import json
+import time
+from contextvars import ContextVar
+from http import HTTPStatus
+from typing import Optional
+
+from sqlalchemy import event, text
+from sqlmodel import Session
+
+
+class RequestDeadline:
+    """Instante límite (reloj monotónico) de la petición en curso."""
+
+    def __init__(self, timeout: float):
+        self.started_at = time.monotonic()
+        self.expires_at = self.started_at + timeout
+        self.changed = asyncio.Event()
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    def set_timeout(self, timeout: float) -> None:
+        self.expires_at = self.started_at + timeout
+        self.changed.set()
+
+
+_current_deadline: ContextVar[Optional[RequestDeadline]] = ContextVar("request_deadline", default=None)
+
+
+def current_deadline() -> Optional[RequestDeadline]:
+    return _current_deadline.get()
+
+
+def request_timeout(seconds: float):
+    """
+    Dependencia que fija el plazo de las peticiones de un router o endpoint,
+    contado desde que llegó la petición.
+    Ejemplo:   dependencies=[Depends(request_timeout(60))]
+    """
+    async def _dep():
+        deadline = current_deadline()
+        if deadline is not None:
+            deadline.set_timeout(seconds)
+
+    return _dep
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_statement_timeout(session, transaction, connection):
+    # Cada transacción de una petición con plazo hereda lo que le queda como
+    # `statement_timeout` de Postgres: una consulta atascada no sobrevive a la petición.
+    deadline = current_deadline()
+    if deadline is None or connection.dialect.name != "postgresql":
+        return
+    timeout_ms = max(1, int(deadline.remaining() * 1000))
+    connection.execute(
+        text(f"SET LOCAL statement_timeout = {timeout_ms}").execution_options(query_stats=False)
+    )
+
+
+class DeadlineMiddleware:
+    """
+    Middleware ASGI que limita cada petición HTTP a `timeout` segundos.
+
+    - Al agotarse el plazo cancela el trabajo en curso y, si aún no se ha
+      empezado a enviar la respuesta, responde 504 en el acto.
+    - Si el cliente se desconecta, cancela el trabajo en curso.
+    - `timeout` <= 0 desactiva el middleware.
+    """
+
+    def __init__(self, app, timeout: float):
+        self.app = app
+        self.timeout = timeout
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.timeout <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        deadline = RequestDeadline(self.timeout)
+        disconnected = asyncio.Event()
+        response_started = False
+        abandoned = False
+        listener: Optional[asyncio.Task] = None
+
+        async def listen_for_disconnect():
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    disconnected.set()
+                    return
+
+        def start_listener():
+            nonlocal listener
+            if listener is None:
+                listener = asyncio.create_task(listen_for_disconnect())
+
+        async def guarded_receive():
+            # Una vez leído el cuerpo, el canal lo vigila `listen_for_disconnect`.
+            if listener is not None:
+                await disconnected.wait()
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request" and not message.get("more_body", False):
+                start_listener()
+            elif message["type"] == "http.disconnect":
+                disconnected.set()
+            return message
+
+        async def guarded_send(message):
+            nonlocal response_started
+            if abandoned:
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        headers = dict(scope.get("headers") or [])
+        if int(headers.get(b"content-length") or 0) == 0 and b"transfer-encoding" not in headers:
+            # Sin cuerpo: el endpoint puede no llamar nunca a receive().
+            start_listener()
+
+        token = _current_deadline.set(deadline)
+        try:
+            task = asyncio.create_task(self.app(scope, guarded_receive, guarded_send))
+        finally:
+            _current_deadline.reset(token)
+
+        disconnect_waiter = asyncio.create_task(disconnected.wait())
+        try:
+            while not task.done():
+                deadline.changed.clear()
+                changed_waiter = asyncio.create_task(deadline.changed.wait())
+                try:
+                    await asyncio.wait(
+                        {task, disconnect_waiter, changed_waiter},
+                        timeout=max(0, deadline.remaining()),
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                finally:
+                    changed_waiter.cancel()
+
+                if task.done():
+                    break
+                if disconnected.is_set():
+                    abandoned = True
+                    self._cancel(task)
+                    return
+                if deadline.remaining() <= 0:
+                    abandoned = True
+                    self._cancel(task)
+                    if not response_started:
+                        await self._send_timeout(send)
+                    return
+
+            task.result()
+        finally:
+            disconnect_waiter.cancel()
+            if listener is not None:
+                listener.cancel()
+
+    @staticmethod
+    def _cancel(task: asyncio.Task) -> None:
+        # La tarea termina de deshacerse en segundo plano (cierre de sesiones, etc.).
+        task.cancel()
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+
+    async def _send_timeout(self, send) -> None:
+        body = json.dumps({"detail": "Tiempo de respuesta agotado"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": HTTPStatus.GATEWAY_TIMEOUT,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,104 @@
+# backend_async\src\core\hashing.py
+
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from http import HTTPStatus
+from typing import Any, Callable, Dict
+
+from fastapi import HTTPException
+from werkzeug.security import check_password_hash, generate_password_hash
+
+from .settings import settings
+
+
+class PasswordHasher:
+    """
+    Ejecuta el hash de contraseñas (deliberadamente costoso en CPU) en un pool
+    de hilos dedicado y acotado, fuera del event loop.
+
+    - Admite como máximo `workers + max_queue` operaciones en curso; a partir
+      de ahí rechaza con 503 en lugar de acumular peticiones.
+    - Lleva métricas de profundidad de cola y latencia de hash.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pwd-hash")
+        self._slots = threading.BoundedSemaphore(workers + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.hash_seconds_total = 0.0
+        self.hash_seconds_max = 0.0
+        self.wait_seconds_total = 0.0
+
+    def _submit(self, func: Callable[..., Any], *args: Any) -> Future:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise HTTPException(
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                detail="Servicio de autenticación saturado. Inténtelo más tarde.",
+            )
+
+        with self._lock:
+            self._in_flight += 1
+        submitted_at = time.perf_counter()
+
+        def _run() -> Any:
+            started_at = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                elapsed = time.perf_counter() - started_at
+                with self._lock:
+                    self.completed += 1
+                    self.hash_seconds_total += elapsed
+                    self.hash_seconds_max = max(self.hash_seconds_max, elapsed)
+                    self.wait_seconds_total += started_at - submitted_at
+
+        def _release(_: Future) -> None:
+            with self._lock:
+                self._in_flight -= 1
+            self._slots.release()
+
+        try:
+            future = self._executor.submit(_run)
+        except Exception:
+            _release(None)
+            raise
+        future.add_done_callback(_release)
+        return future
+
+    async def check(self, hashed_password: str, plain_password: str) -> bool:
+        return await asyncio.wrap_future(self._submit(check_password_hash, hashed_password, plain_password))
+
+    async def generate(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(generate_password_hash, password))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            in_flight = self._in_flight
+            completed = self.completed
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "in_flight": in_flight,
+                "queue_depth": max(0, in_flight - self.workers),
+                "completed": completed,
+                "rejected": self.rejected,
+                "hash_seconds_total": self.hash_seconds_total,
+                "hash_seconds_avg": (self.hash_seconds_total / completed) if completed else 0.0,
+                "hash_seconds_max": self.hash_seconds_max,
+                "wait_seconds_total": self.wait_seconds_total,
+            }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.HASH_POOL_WORKERS,
+    max_queue=settings.HASH_POOL_MAX_QUEUE,
+)
@@ -1,39 +1,58 @@
 # backend\src\core\manager_db_sync.py
 
+import time
 from functools import wraps
-from sqlmodel import Session, SQLModel, create_engine
+from logging import Logger
+from sqlmodel import Session, create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool, NullPool, AsyncAdaptedQueuePool
 from typing import Generator
 
 
+from .lazy_session import LazySession
+from .metrics import TimedQueuePool, instrument_engine
+from .query_stats import instrument_queries
+from .schema import SCHEMA_VERSION, ensure_schema
 from .settings import settings
 
 
 engine = create_engine(url=settings.SQLALCHEMY_DATABASE_URI,
                        echo=False,
                        pool_pre_ping=True,
-                       pool_recycle=1800,
-                    #    connect_args={"timeout": 30},  # Incrementa el tiempo de espera a 30 segundos
-                    #    poolclass=QueuePool,  # O utiliza NullPool si quieres mantenerlas al mínimo
-                    #    max_overflow=5,  # Conexiones adicionales permitidas si el pool está lleno
-                    #    pool_timeout=30,  # Tiempo máximo de espera para obtener una conexión
-                       
+                       poolclass=TimedQueuePool,
+                       pool_size=settings.DB_POOL_SIZE,
+                       max_overflow=settings.DB_MAX_OVERFLOW,
+                       pool_timeout=settings.DB_POOL_TIMEOUT,
+                       pool_recycle=settings.DB_POOL_RECYCLE,
                        )
 
+instrument_engine(engine, "sync")
+instrument_queries(engine)
+
 SessionLocal = sessionmaker(bind=engine, class_=Session, expire_on_commit=False)
 
-def init_db():
+def init_db(logger: Logger):
     from applications.reservas.models import Pacientes
     from core.models.sessions import Sessions
     from core.models.users import Users
-        
+
+    start = time.perf_counter()
     with engine.begin() as conn:
-        SQLModel.metadata.create_all(conn)
+        applied = ensure_schema(conn)
+    logger.info(
+        "init_db (%s): %s en %.1f ms",
+        settings.DB_STARTUP_MODE,
+        f"esquema v{SCHEMA_VERSION} aplicado" if applied else "esquema al día, sin DDL",
+        (time.perf_counter() - start) * 1000,
+    )
 
 def get_session() -> Generator[Session, None, None]:
-    with SessionLocal() as session:
+    # La conexión se pide al pool en la primera consulta, no al resolver la dependencia.
+    session = LazySession(SessionLocal)
+    try:
         yield session
+    finally:
+        session.close()
 
 
 
@@ -0,0 +1,227 @@
+# backend\src\core\metrics.py
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from .cache import session_cache
+from .hashing import password_hasher
+from .query_stats import route_query_stats
+from .token_utils import token_cache
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Límites (segundos) del histograma de espera por una conexión del pool.
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class PoolMetrics:
+    """
+    Contadores de un pool de conexiones. Se alimentan de los eventos de
+    SQLAlchemy y de `_TimedPoolMixin`; el tamaño y las conexiones en uso se
+    leen del pool en el momento de exportar.
+    """
+
+    def __init__(self, name: str, engine):
+        self.name = name
+        self.engine = engine
+        self._lock = threading.Lock()
+        self.wait_buckets = [0] * len(WAIT_BUCKETS)
+        self.wait_count = 0
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+        self.pre_ping_failures = 0
+
+    def observe_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_sum += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            for i, bound in enumerate(WAIT_BUCKETS):
+                if seconds <= bound:
+                    self.wait_buckets[i] += 1
+
+    def inc(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+# Pools instrumentados, por nombre (etiqueta `pool` en /metrics).
+pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+class _TimedPoolMixin:
+    """Mide cuánto espera cada checkout por una conexión libre del pool."""
+
+    _metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            if self._metrics is not None:
+                self._metrics.inc("timeouts")
+            raise
+        if self._metrics is not None:
+            self._metrics.observe_wait(time.perf_counter() - start)
+        return conn
+
+    def recreate(self):
+        # engine.dispose() sustituye el pool: se conservan las métricas.
+        pool = super().recreate()
+        pool._metrics = self._metrics
+        return pool
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine, name: str) -> PoolMetrics:
+    """
+    Registra los eventos del pool de `engine` (síncrono o `AsyncEngine`).
+    Para medir la espera del checkout el engine debe crearse con
+    `poolclass=TimedQueuePool` / `TimedAsyncAdaptedQueuePool`.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    metrics = PoolMetrics(name, sync_engine)
+    sync_engine.pool._metrics = metrics
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.inc("checkouts")
+        if sync_engine.pool.overflow() > 0:
+            metrics.inc("overflow_checkouts")
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.inc("invalidations")
+
+    @event.listens_for(sync_engine, "soft_invalidate")
+    def _on_soft_invalidate(dbapi_connection, connection_record, exception):
+        metrics.inc("soft_invalidations")
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(context):
+        if context.is_pre_ping:
+            metrics.inc("pre_ping_failures")
+
+    pool_metrics[name] = metrics
+    return metrics
+
+
+def _family(lines: List[str], name: str, kind: str, help_: str) -> None:
+    lines.append(f"# HELP {name} {help_}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _labels(**labels: Any) -> str:
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+
+
+def _render_pools(lines: List[str]) -> None:
+    pools = list(pool_metrics.values())
+    if not pools:
+        return
+
+    gauges = (
+        ("db_pool_size", "Conexiones persistentes configuradas en el pool.", lambda m: m.engine.pool.size()),
+        ("db_pool_checked_out", "Conexiones prestadas en este momento.", lambda m: m.engine.pool.checkedout()),
+        ("db_pool_checked_in", "Conexiones libres en el pool.", lambda m: m.engine.pool.checkedin()),
+        ("db_pool_overflow", "Conexiones de overflow abiertas en este momento.", lambda m: max(0, m.engine.pool.overflow())),
+        ("db_pool_checkout_wait_max_seconds", "Mayor espera observada por una conexión.", lambda m: m.wait_max),
+    )
+    for name, help_, value in gauges:
+        _family(lines, name, "gauge", help_)
+        for m in pools:
+            lines.append(f"{name}{_labels(pool=m.name)} {value(m)}")
+
+    counters = (
+        ("db_pool_checkouts_total", "Conexiones entregadas por el pool.", "checkouts"),
+        ("db_pool_overflow_checkouts_total", "Conexiones entregadas con el pool en overflow.", "overflow_checkouts"),
+        ("db_pool_checkout_timeouts_total", "Esperas que agotaron pool_timeout.", "timeouts"),
+        ("db_pool_invalidations_total", "Conexiones invalidadas.", "invalidations"),
+        ("db_pool_soft_invalidations_total", "Conexiones marcadas para reciclar.", "soft_invalidations"),
+        ("db_pool_pre_ping_failures_total", "Fallos de pool_pre_ping.", "pre_ping_failures"),
+    )
+    for name, help_, attr in counters:
+        _family(lines, name, "counter", help_)
+        for m in pools:
+            lines.append(f"{name}{_labels(pool=m.name)} {getattr(m, attr)}")
+
+    name = "db_pool_checkout_wait_seconds"
+    _family(lines, name, "histogram", "Espera por una conexión del pool.")
+    for m in pools:
+        with m._lock:
+            buckets, count, total = list(m.wait_buckets), m.wait_count, m.wait_sum
+        for bound, hits in zip(WAIT_BUCKETS, buckets):
+            lines.append(f"{name}_bucket{_labels(pool=m.name, le=bound)} {hits}")
+        lines.append(f'{name}_bucket{_labels(pool=m.name, le="+Inf")} {count}')
+        lines.append(f"{name}_sum{_labels(pool=m.name)} {total}")
+        lines.append(f"{name}_count{_labels(pool=m.name)} {count}")
+
+
+def _render_routes(lines: List[str]) -> None:
+    routes = route_query_stats.snapshot()
+    if not routes:
+        return
+    for i, (name, help_) in enumerate((
+        ("http_requests_total", "Peticiones atendidas por ruta."),
+        ("http_request_db_queries_total", "Sentencias SQL ejecutadas por ruta."),
+        ("http_request_db_seconds_total", "Tiempo en BD por ruta."),
+        ("http_requests_over_query_budget_total", "Peticiones que superaron su presupuesto de consultas."),
+    )):
+        _family(lines, name, "counter", help_)
+        for route, totals in routes.items():
+            lines.append(f"{name}{_labels(route=route)} {totals[i]}")
+
+
+def _render_caches(lines: List[str]) -> None:
+    caches = {"session": session_cache.stats(), "token": token_cache.stats()}
+    for key, kind, help_ in (
+        ("size", "gauge", "Entradas en la caché."),
+        ("hits", "counter", "Aciertos de la caché."),
+        ("misses", "counter", "Fallos de la caché."),
+    ):
+        name = f"cache_{key}" if kind == "gauge" else f"cache_{key}_total"
+        _family(lines, name, kind, help_)
+        for cache, stats in caches.items():
+            lines.append(f"{name}{_labels(cache=cache)} {stats[key]}")
+
+
+def _render_hasher(lines: List[str]) -> None:
+    stats = password_hasher.stats()
+    for name, kind, help_, key in (
+        ("password_hash_in_flight", "gauge", "Operaciones de hash en curso o en cola.", "in_flight"),
+        ("password_hash_queue_depth", "gauge", "Operaciones de hash esperando un worker.", "queue_depth"),
+        ("password_hash_completed_total", "counter", "Operaciones de hash completadas.", "completed"),
+        ("password_hash_rejected_total", "counter", "Operaciones de hash rechazadas con 503.", "rejected"),
+        ("password_hash_seconds_total", "counter", "Tiempo total de cálculo de hash.", "hash_seconds_total"),
+    ):
+        _family(lines, name, kind, help_)
+        lines.append(f"{name} {stats[key]}")
+
+
+def render_metrics() -> str:
+    """Métricas del proceso en formato de texto de Prometheus."""
+    lines: List[str] = []
+    _render_pools(lines)
+    _render_routes(lines)
+    _render_caches(lines)
+    _render_hasher(lines)
+    return "\n".join(lines) + "\n"
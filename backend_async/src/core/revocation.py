@@ -0,0 +1,96 @@
+# backend_async\src\core\revocation.py
+
+import asyncio
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from logging import Logger
+from typing import Dict, Optional
+
+from sqlalchemy import or_
+from sqlmodel import select
+
+from .settings import settings
+from .manager_db_async import async_session_backgroung
+from .models.revoked_sessions import RevokedSessions
+
+
+# `revoked_at` lo fija now() de Postgres (inicio de la transacción), así que una
+# revocación puede confirmarse con una marca algo anterior a la última vista.
+_REFRESH_OVERLAP = timedelta(seconds=5)
+
+
+class RevocationList:
+    """
+    Lista en memoria de `sub` revocados, refrescada de forma incremental desde
+    la tabla `sesiones_revocadas`. Permite rechazar tokens revocados sin
+    consultar la BD en cada petición.
+    """
+
+    def __init__(self):
+        self._revoked: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.last_seen: Optional[datetime] = None
+
+    def is_revoked(self, sub: str) -> bool:
+        return sub in self._revoked
+
+    def add(self, sub: str, exp: Optional[datetime] = None) -> None:
+        expires_at = exp.timestamp() if exp else float("inf")
+        with self._lock:
+            self._revoked[sub] = expires_at
+
+    def prune(self) -> int:
+        """Olvida los `sub` cuyo token ya ha caducado por sí mismo."""
+        now = time.time()
+        with self._lock:
+            expired = [sub for sub, expires_at in self._revoked.items() if expires_at <= now]
+            for sub in expired:
+                del self._revoked[sub]
+        return len(expired)
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+revocation_list = RevocationList()
+
+
+async def refresh_revocation_list() -> int:
+    """
+    Incorpora las revocaciones registradas desde la última pasada.
+
+    :return: Número de filas leídas de `sesiones_revocadas`.
+    """
+    statement = select(
+        RevokedSessions.token, RevokedSessions.exp, RevokedSessions.revoked_at
+    ).where(
+        or_(RevokedSessions.exp.is_(None), RevokedSessions.exp > datetime.now(timezone.utc))
+    )
+    if revocation_list.last_seen is not None:
+        statement = statement.where(RevokedSessions.revoked_at > revocation_list.last_seen - _REFRESH_OVERLAP)
+
+    async with async_session_backgroung() as session:
+        result = await session.exec(statement)
+        rows = result.all()
+
+    for token, exp, revoked_at in rows:
+        revocation_list.add(token, exp)
+        if revocation_list.last_seen is None or revoked_at > revocation_list.last_seen:
+            revocation_list.last_seen = revoked_at
+
+    revocation_list.prune()
+    return len(rows)
+
+
+async def run_revocation_refresher(logger: Logger) -> None:
+    """
+    Bucle periódico que mantiene al día la lista de revocados. Se lanza como
+    tarea desde el `lifespan` de la aplicación.
+    """
+    while True:
+        try:
+            await refresh_revocation_list()
+        except Exception as e:
+            logger.error("Error al refrescar la lista de sesiones revocadas: %s", e, exc_info=True)
+        await asyncio.sleep(settings.REVOCATION_REFRESH_SECONDS)
@@ -1,19 +1,19 @@
 # backend\src\core\security.py
 
 
-from datetime import datetime, timezone
-from sqlmodel import select
+from datetime import datetime, timedelta, timezone
 from sqlmodel.ext.asyncio.session import AsyncSession
-from fastapi import  HTTPException, Query, Depends, Request
+from fastapi import  HTTPException, Query, Depends, Request, Response
 from http import HTTPStatus
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Set
 
 
 from .settings import settings
+from .cache import session_cache
+from .revocation import revocation_list
 from .manager_db_async import get_session
 from .session_manager import SessionManager
-from .token_utils import verify_token
-from .models.sessions import Sessions
+from .token_utils import can_defer_auth_cookie, create_token, defer_auth_cookie, verify_token
 from .models.users import Users
 
 
@@ -26,17 +26,18 @@ async def require_secret(secret: str = Query(...)):
 
 async def require_auth(
     request: Request,
+    response: Response,
     roles: Optional[List[str]] = None, 
     session: AsyncSession = Depends(get_session),
 ) -> Dict[str, Any]:
     """
     Autenticación basada en la cookie `X-Sync.Ref`.
 
-    - Valida el JWT y la sesión en BD.
+    - Valida el JWT y la sesión en BD (o en la caché de sesiones validadas).
+    - Con `AUTH_MODE=stateless` solo valida el JWT y la lista de revocados.
     - Opcionalmente comprueba que el usuario tenga alguno de los `roles`.
+    - Renueva la sesión (y la cookie) cuando ha consumido parte de su vida.
     """
-    await SessionManager(session, request.app.state.logger).purge_expired_sessions()
-
     token_cookie = request.cookies.get("X-Sync.Ref")
     if not token_cookie:
         raise HTTPException(
@@ -59,32 +60,144 @@ async def require_auth(
             detail="Token sin identificador de sesión (sub)",
         )
 
-    result = await session.exec(select(Sessions).where(Sessions.token == uuid_))
-    sesion = result.first()
-    if not sesion:
+    if revocation_list.is_revoked(uuid_):
         raise HTTPException(
             status_code=HTTPStatus.UNAUTHORIZED,
-            detail="Sesión no encontrada o inválida",
+            detail="Sesión revocada",
         )
 
-    if sesion.exp < datetime.now(timezone.utc):
-        raise HTTPException(
-            status_code=HTTPStatus.UNAUTHORIZED,
-            detail="Sesión expirada",
-        )
+    if settings.AUTH_MODE == "stateless":
+        user = _authorize_stateless(payload, uuid_, roles)
+        await _renew_session_if_due(request, session, payload, uuid_)
+        return user
+
+    cached = session_cache.get(uuid_)
+    if cached is None:
+        sesion = await SessionManager(session, request.app.state.logger).get_session(uuid_)
+
+        if not sesion:
+            raise HTTPException(
+                status_code=HTTPStatus.UNAUTHORIZED,
+                detail="Sesión no encontrada o inválida",
+            )
+
+        if sesion["exp"] is None or sesion["exp"] < datetime.now(timezone.utc):
+            raise HTTPException(
+                status_code=HTTPStatus.UNAUTHORIZED,
+                detail="Sesión expirada",
+            )
+
+        cached = sesion
+        session_cache.set(uuid_, cached, expires_at=sesion["exp"].timestamp())
+        # La conexión vuelve al pool antes de ejecutar el endpoint.
+        await session.release()
 
     if roles is not None:
-        result_user = await session.exec(select(Users).where(Users.usu == sesion.usu))
-        user = result_user.first()
-        
-        if not user or user.role not in roles:
+        if cached["role"] not in roles:
             raise HTTPException(
                 status_code=HTTPStatus.FORBIDDEN,
                 detail="Permisos insuficientes para este recurso",
             )
 
+    await _renew_session_if_due(request, session, payload, uuid_)
+
+    return {
+        "username": cached["usu"],
+        "uuid": uuid_,
+        "token_payload": payload,
+    }
+
+
+# Sesiones con una renovación en curso en este proceso: las peticiones
+# concurrentes de la misma sesión no repiten la escritura.
+_renewals_in_flight: Set[str] = set()
+
+
+async def _renew_session_if_due(
+    request: Request,
+    session: AsyncSession,
+    payload: Dict[str, Any],
+    uuid_: str,
+) -> None:
+    """
+    Renovación deslizante: si el token del cliente ha consumido más de
+    `SESSION_RENEW_FRACTION` de su vida, amplía el `exp` de la sesión y reemite
+    la cookie con el mismo `sub`. Un fallo al renovar se registra pero no
+    rechaza la petición.
+
+    - Se decide por el `exp` del token, no por el de la sesión: si una cookie
+      renovada no llega al cliente, su siguiente petición vuelve a renovar.
+    - La cookie va en la respuesta que devuelva el endpoint (304, streaming,
+      `JSONResponse`...) mediante `AuthCookieMiddleware`; sin él no se renueva.
+    - En modo stateless el usuario y su rol se releen de `usuarios`: un
+      usuario borrado no se renueva y un cambio de rol entra en el nuevo token.
+    """
+    if not settings.SESSION_SLIDING_ENABLED:
+        return
+
+    now = datetime.now(timezone.utc)
+    lifetime = settings.TOKEN_SECONDS_EXP
+    renew_if_before = now + timedelta(seconds=lifetime * (1 - settings.SESSION_RENEW_FRACTION))
+    exp = datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+    if exp >= renew_if_before or uuid_ in _renewals_in_flight:
+        return
+
+    if not can_defer_auth_cookie():
+        # Sin AuthCookieMiddleware el cliente no recibiría la cookie renovada.
+        return
+
+    _renewals_in_flight.add(uuid_)
+    try:
+        new_exp = now + timedelta(seconds=lifetime)
+        role = payload.get("role")
+        if settings.AUTH_MODE == "stateless":
+            user = await session.get(Users, payload.get("usu") or "")
+            await session.release()
+            if user is None:
+                return
+            role = user.role
+        else:
+            renewed = await SessionManager(session, request.app.state.logger).renew_session(
+                uuid_, new_exp, renew_if_before
+            )
+            await session.release()
+            if not renewed:
+                # La sesión ya no existe (p. ej. logout concurrente): sin cookie nueva.
+                return
+
+        token = create_token(
+            username=payload.get("usu"),
+            role=role,
+            sub=uuid_,
+            expires_at=new_exp,
+        )
+        defer_auth_cookie(token)
+    except Exception as e:
+        request.app.state.logger.error("No se pudo renovar la sesión: %s", e, exc_info=True)
+    finally:
+        _renewals_in_flight.discard(uuid_)
+
+
+def _authorize_stateless(payload: Dict[str, Any], uuid_: str, roles: Optional[List[str]]) -> Dict[str, Any]:
+    """
+    Modo `AUTH_MODE=stateless`: la firma del JWT ya está verificada y el usuario
+    y su rol viajan como claims, así que no se consulta la BD.
+    """
+    username = payload.get("usu")
+    if not username:
+        raise HTTPException(
+            status_code=HTTPStatus.UNAUTHORIZED,
+            detail="Token sin usuario (usu)",
+        )
+
+    if roles is not None and payload.get("role") not in roles:
+        raise HTTPException(
+            status_code=HTTPStatus.FORBIDDEN,
+            detail="Permisos insuficientes para este recurso",
+        )
+
     return {
-        "username": sesion.usu,
+        "username": username,
         "uuid": uuid_,
         "token_payload": payload,
     }
@@ -98,9 +211,10 @@ def require_roles(*roles: str):
     """
     async def _dep(
         request: Request,
+        response: Response,
         session: AsyncSession = Depends(get_session),
     ):
-        return await require_auth(request, roles=list(roles), session=session)
+        return await require_auth(request, response, roles=list(roles), session=session)
 
     return _dep          
 
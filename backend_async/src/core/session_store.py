@@ -0,0 +1,231 @@
+# backend_async\src\core\session_store.py
+
+import json
+from abc import ABC, abstractmethod
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, literal_column, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from .settings import settings
+from .models.sessions import Sessions
+from .models.users import Users
+
+
+async def purge_expired_rows(session: AsyncSession, model, batch_size: int) -> int:
+    """
+    Borra las filas de `model` con `exp` < ahora UTC en lotes de `batch_size`.
+
+    Cada lote se borra por `ctid` y se confirma por separado, de modo que
+    una purga larga nunca retiene muchos bloqueos a la vez. Las filas que
+    otro proceso ya está borrando se saltan (`SKIP LOCKED`).
+    """
+    total = 0
+    now = datetime.now(timezone.utc)
+    while True:
+        expired = (
+            select(literal_column("ctid"))
+            .select_from(model.__table__)
+            .where(model.exp < now)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = delete(model).where(literal_column("ctid").in_(expired))
+        result = await session.exec(stmt)
+        await session.commit()
+
+        total += result.rowcount
+        if result.rowcount < batch_size:
+            return total
+
+
+class SessionStore(ABC):
+    """
+    Interfaz de almacenamiento de sesiones. Un registro de sesión es un dict
+    `{"usu": str, "exp": datetime, "role": Optional[str]}` indexado por el `sub` del JWT.
+    """
+
+    @abstractmethod
+    async def get(self, uuid: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    async def create(self, uuid: str, username: str, exp: datetime, role: Optional[str] = None) -> None:
+        ...
+
+    @abstractmethod
+    async def delete(self, uuid: str) -> None:
+        ...
+
+    @abstractmethod
+    async def renew(self, uuid: str, exp: datetime, renew_if_before: datetime) -> bool:
+        """
+        Amplía la sesión hasta `exp` solo si su expiración actual es anterior a
+        `renew_if_before`. Devuelve True si ha escrito la renovación.
+        """
+        ...
+
+    @abstractmethod
+    async def purge_expired(self, batch_size: int = 1000) -> int:
+        ...
+
+
+class SQLSessionStore(SessionStore):
+    """Sesiones en la tabla `sesiones` de Postgres (comportamiento por defecto)."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get(self, uuid: str) -> Optional[Dict[str, Any]]:
+        # Sesión y rol del usuario en un único viaje a BD (sesiones ⋈ usuarios).
+        result = await self.session.exec(
+            select(Sessions.usu, Sessions.exp, Users.role)
+            .outerjoin(Users, Users.usu == Sessions.usu)
+            .where(Sessions.token == uuid)
+        )
+        sesion = result.first()
+        if not sesion:
+            return None
+        return {"usu": sesion.usu, "exp": sesion.exp, "role": sesion.role}
+
+    async def create(self, uuid: str, username: str, exp: datetime, role: Optional[str] = None) -> None:
+        self.session.add(Sessions(token=uuid, usu=username, exp=exp))
+        await self.session.commit()
+
+    async def delete(self, uuid: str) -> None:
+        await self.session.exec(delete(Sessions).where(Sessions.token == uuid))
+        await self.session.commit()
+
+    async def renew(self, uuid: str, exp: datetime, renew_if_before: datetime) -> bool:
+        # Condicional: entre varios workers solo el primero escribe la renovación.
+        result = await self.session.exec(
+            update(Sessions)
+            .where(Sessions.token == uuid, Sessions.exp < renew_if_before)
+            .values(exp=exp)
+        )
+        await self.session.commit()
+        return result.rowcount > 0
+
+    async def purge_expired(self, batch_size: int = 1000) -> int:
+        return await purge_expired_rows(self.session, Sessions, batch_size)
+
+
+class MemorySessionStore(SessionStore):
+    """
+    Sesiones en un dict del proceso. Solo válido con un único worker: cada
+    proceso tiene su propio almacén.
+    """
+
+    def __init__(self):
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    async def get(self, uuid: str) -> Optional[Dict[str, Any]]:
+        record = self._sessions.get(uuid)
+        return dict(record) if record else None
+
+    async def create(self, uuid: str, username: str, exp: datetime, role: Optional[str] = None) -> None:
+        with self._lock:
+            self._sessions[uuid] = {"usu": username, "exp": exp, "role": role}
+
+    async def delete(self, uuid: str) -> None:
+        with self._lock:
+            self._sessions.pop(uuid, None)
+
+    async def renew(self, uuid: str, exp: datetime, renew_if_before: datetime) -> bool:
+        with self._lock:
+            record = self._sessions.get(uuid)
+            if not record or record["exp"] >= renew_if_before:
+                return False
+            record["exp"] = exp
+            return True
+
+    async def purge_expired(self, batch_size: int = 1000) -> int:
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            expired = [uuid for uuid, record in self._sessions.items() if record["exp"] < now]
+            for uuid in expired:
+                del self._sessions[uuid]
+        return len(expired)
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Sesiones en cualquier servidor que hable el protocolo de Redis. Cada
+    sesión es una clave `REDIS_SESSION_PREFIX + sub` que caduca sola en su `exp`.
+    """
+
+    def __init__(self, url: str, prefix: str):
+        import redis.asyncio
+
+        self.client = redis.asyncio.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+
+    async def get(self, uuid: str) -> Optional[Dict[str, Any]]:
+        raw = await self.client.get(self.prefix + uuid)
+        if raw is None:
+            return None
+        record = json.loads(raw)
+        record["exp"] = datetime.fromtimestamp(record["exp"], tz=timezone.utc)
+        return record
+
+    @staticmethod
+    def _ttl(exp: datetime) -> int:
+        return max(1, int(exp.timestamp() - time.time()) + 1)
+
+    async def create(self, uuid: str, username: str, exp: datetime, role: Optional[str] = None) -> None:
+        value = json.dumps({"usu": username, "exp": exp.timestamp(), "role": role})
+        await self.client.set(self.prefix + uuid, value, ex=self._ttl(exp))
+
+    async def delete(self, uuid: str) -> None:
+        await self.client.delete(self.prefix + uuid)
+
+    async def renew(self, uuid: str, exp: datetime, renew_if_before: datetime) -> bool:
+        key = self.prefix + uuid
+
+        # Comparar y ampliar con WATCH/MULTI: si otro worker modifica la clave
+        # entre la lectura y la escritura, se reintenta y ya la ve renovada.
+        async def compare_and_extend(pipe) -> bool:
+            raw = await pipe.get(key)
+            if raw is None:
+                return False
+            record = json.loads(raw)
+            if record["exp"] >= renew_if_before.timestamp():
+                return False
+            record["exp"] = exp.timestamp()
+            pipe.multi()
+            pipe.set(key, json.dumps(record), ex=self._ttl(exp))
+            return True
+
+        return await self.client.transaction(compare_and_extend, key, value_from_callable=True)
+
+    async def purge_expired(self, batch_size: int = 1000) -> int:
+        # Redis elimina las claves caducadas por sí mismo.
+        return 0
+
+
+_shared_store: Optional[SessionStore] = None
+_shared_store_lock = threading.Lock()
+
+
+def get_session_store(session: AsyncSession) -> SessionStore:
+    """
+    Devuelve el almacén de sesiones configurado en `SESSION_STORE`.
+    Los almacenes en memoria y Redis se comparten en todo el proceso.
+    """
+    global _shared_store
+
+    if settings.SESSION_STORE == "sql":
+        return SQLSessionStore(session)
+
+    if _shared_store is None:
+        with _shared_store_lock:
+            if _shared_store is None:
+                if settings.SESSION_STORE == "redis":
+                    _shared_store = RedisSessionStore(settings.REDIS_URL, settings.REDIS_SESSION_PREFIX)
+                else:
+                    _shared_store = MemorySessionStore()
+    return _shared_store
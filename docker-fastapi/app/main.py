@@ -1,3 +1,6 @@
+import os
+import anyio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
@@ -8,7 +11,17 @@ except:
     from routers import hello, greet, json_response
 
 def create_app() -> FastAPI:
-    app = FastAPI()
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Las rutas `def` se ejecutan en el pool de hilos de AnyIO (40 hilos por
+        # defecto). THREADPOOL_SIZE lo ajusta por despliegue.
+        threads = os.environ.get("THREADPOOL_SIZE")
+        if threads:
+            anyio.to_thread.current_default_thread_limiter().total_tokens = int(threads)
+        yield
+
+    app = FastAPI(lifespan=lifespan)
 
     # Configuración de CORS
     app.add_middleware(
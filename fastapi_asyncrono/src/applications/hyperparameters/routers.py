@@ -3,7 +3,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
-from src.core.manager_db import get_session
+from src.core.manager_db import get_session, get_read_session
 from http import HTTPStatus
 from .controllers import HyperparameterService
 from .schemas import HyperparameterCreateModel, HyperparameterResponseModel
@@ -14,13 +14,13 @@ hyperparameter_router = APIRouter(
 )
 
 @hyperparameter_router.get("/", response_model=List[HyperparameterResponseModel])
-async def read_hyperparameters(session: AsyncSession = Depends(get_session)):
+async def read_hyperparameters(session: AsyncSession = Depends(get_read_session)):
     """Get all hyperparameter sets."""
     hyperparameters = await HyperparameterService(session).get_all_hyperparameters()
     return hyperparameters
 
 @hyperparameter_router.get("/prompt/{prompt_id}", response_model=List[HyperparameterResponseModel], status_code=HTTPStatus.OK)
-async def read_hyperparameters_by_prompt(prompt_id: int, session: AsyncSession = Depends(get_session)):
+async def read_hyperparameters_by_prompt(prompt_id: int, session: AsyncSession = Depends(get_read_session)):
     """Get all hyperparameter sets for a specific prompt."""
     hyperparameters = await HyperparameterService(session).get_hyperparameters_by_prompt(prompt_id)
     return hyperparameters
@@ -34,7 +34,7 @@ async def create_hyperparameter(
     return new_hyperparameter
 
 @hyperparameter_router.get("/{hyperparameter_id}", response_model=HyperparameterResponseModel, status_code=HTTPStatus.OK)
-async def read_hyperparameter(hyperparameter_id: int, session: AsyncSession = Depends(get_session)):
+async def read_hyperparameter(hyperparameter_id: int, session: AsyncSession = Depends(get_read_session)):
     """Get a hyperparameter set by its ID."""
     hyperparameter = await HyperparameterService(session).get_hyperparameter(hyperparameter_id)
     if not hyperparameter:
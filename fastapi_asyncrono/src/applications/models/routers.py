@@ -3,7 +3,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
-from src.core.manager_db import get_session
+from src.core.manager_db import get_session, get_read_session
 from http import HTTPStatus
 from .controllers import ModelService
 from .schemas import ModelCreateModel, ModelResponseModel
@@ -14,13 +14,13 @@ model_router = APIRouter(
 )
 
 @model_router.get("/", response_model=List[ModelResponseModel])
-async def read_models(session: AsyncSession = Depends(get_session)):
+async def read_models(session: AsyncSession = Depends(get_read_session)):
     """Get all models."""
     models = await ModelService(session).get_all_models()
     return models
 
 @model_router.get("/project/{project_id}", response_model=List[ModelResponseModel], status_code=HTTPStatus.OK)
-async def read_models_by_project(project_id: int, session: AsyncSession = Depends(get_session)):
+async def read_models_by_project(project_id: int, session: AsyncSession = Depends(get_read_session)):
     """Get all models for a specific project."""
     models = await ModelService(session).get_models_by_project(project_id)
     return models
@@ -34,7 +34,7 @@ async def create_model(
     return new_model
 
 @model_router.get("/{model_id}", response_model=ModelResponseModel, status_code=HTTPStatus.OK)
-async def read_model(model_id: int, session: AsyncSession = Depends(get_session)):
+async def read_model(model_id: int, session: AsyncSession = Depends(get_read_session)):
     """Get a model by its ID."""
     model = await ModelService(session).get_model(model_id)
     if not model:
@@ -0,0 +1 @@
+# src\applications\monitoring\__init__.py
\ No newline at end of file
@@ -0,0 +1,26 @@
+# src\applications\monitoring\routers.py
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from http import HTTPStatus
+
+from src.config import settings
+from src.core.metrics import PROMETHEUS_CONTENT_TYPE, render_metrics
+from src.core.query_stats import query_stats
+
+async def require_admin_key(api_key: str = Query(...)):
+    if not settings.ADMIN_API_KEY or api_key != settings.ADMIN_API_KEY:
+        raise HTTPException(status_code=HTTPStatus.UNAUTHORIZED, detail="Unauthorized")
+
+monitoring_router = APIRouter(
+    tags=["monitoring"]
+)
+
+@monitoring_router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Connection pool metrics for Prometheus."""
+    return Response(content=render_metrics(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+@monitoring_router.get("/admin/queries", dependencies=[Depends(require_admin_key)])
+async def top_queries(top: int = Query(20, ge=1, le=500)):
+    """SQL statements with the most accumulated time in this process, with their histograms."""
+    return {"statements": query_stats.top(top)}
@@ -5,7 +5,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
 from http import HTTPStatus
 
-from src.core.manager_db import get_session
+from src.core.manager_db import get_session, get_read_session
 from .controllers import ProjectService
 from .schemas import ProjectCreateModel, ProjectResponseModel
 
@@ -15,7 +15,7 @@ project_router = APIRouter(
 )
 
 @project_router.get("/", response_model=List[ProjectResponseModel])
-async def read_projects(session: AsyncSession = Depends(get_session)):
+async def read_projects(session: AsyncSession = Depends(get_read_session)):
     """Get all projects."""
     projects = await ProjectService(session).get_all_projects()
     return projects
@@ -29,7 +29,7 @@ async def create_project(
     return new_project
 
 @project_router.get("/{project_id}", response_model=ProjectResponseModel, status_code=HTTPStatus.OK)
-async def read_project(project_id: int, session: AsyncSession = Depends(get_session)):
+async def read_project(project_id: int, session: AsyncSession = Depends(get_read_session)):
     """Get a project by its ID."""
     project = await ProjectService(session).get_project(project_id)
     if not project:
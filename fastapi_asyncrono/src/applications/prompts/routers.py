@@ -3,7 +3,7 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
-from src.core.manager_db import get_session
+from src.core.manager_db import get_session, get_read_session
 from http import HTTPStatus
 from .controllers import PromptService
 from .schemas import PromptCreateModel, PromptResponseModel
@@ -14,19 +14,19 @@ prompt_router = APIRouter(
 )
 
 @prompt_router.get("/", response_model=List[PromptResponseModel])
-async def read_prompts(session: AsyncSession = Depends(get_session)):
+async def read_prompts(session: AsyncSession = Depends(get_read_session)):
     """Get all prompts."""
     prompts = await PromptService(session).get_all_prompts()
     return prompts
 
 @prompt_router.get("/project/{project_id}", response_model=List[PromptResponseModel], status_code=HTTPStatus.OK)
-async def read_prompts_by_project(project_id: int, session: AsyncSession = Depends(get_session)):
+async def read_prompts_by_project(project_id: int, session: AsyncSession = Depends(get_read_session)):
     """Get all prompts for a specific project."""
     prompts = await PromptService(session).get_prompts_by_project(project_id)
     return prompts
 
 @prompt_router.get("/model/{model_id}", response_model=List[PromptResponseModel], status_code=HTTPStatus.OK)
-async def read_prompts_by_model(model_id: int, session: AsyncSession = Depends(get_session)):
+async def read_prompts_by_model(model_id: int, session: AsyncSession = Depends(get_read_session)):
     """Get all prompts for a specific model."""
     prompts = await PromptService(session).get_prompts_by_model(model_id)
     return prompts
@@ -40,7 +40,7 @@ async def create_prompt(
     return new_prompt
 
 @prompt_router.get("/{prompt_id}", response_model=PromptResponseModel, status_code=HTTPStatus.OK)
-async def read_prompt(prompt_id: int, session: AsyncSession = Depends(get_session)):
+async def read_prompt(prompt_id: int, session: AsyncSession = Depends(get_read_session)):
     """Get a prompt by its ID."""
     prompt = await PromptService(session).get_prompt(prompt_id)
     if not prompt:
@@ -64,7 +64,7 @@ async def delete_prompt(prompt_id: int, session: AsyncSession = Depends(get_sess
     return {}
 
 @prompt_router.get("/fetch/{prompt_id}", status_code=HTTPStatus.OK)
-async def fetch_prompt(prompt_id: int, session: AsyncSession = Depends(get_session)):
+async def fetch_prompt(prompt_id: int, session: AsyncSession = Depends(get_read_session)):
     """
     Fetch detailed information about a prompt, its hyperparameters, and the associated model.
     """
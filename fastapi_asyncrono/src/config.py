@@ -1,6 +1,7 @@
 # src\config.py
 
 import os
+from typing import Literal, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -11,6 +12,27 @@ class Settings(BaseSettings):
     POSTGRES_URL: str
     ENVIRONMENT: str
 
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+
+    DB_ECHO: bool = False  # SQLAlchemy echo: logs every statement, debugging only
+    SLOW_QUERY_MS: float = 200
+    QUERY_STATS_MAX_FINGERPRINTS: int = 500
+    QUERY_BUDGET_PER_REQUEST: int = 20  # log a warning when a request exceeds it
+    N_PLUS_ONE_THRESHOLD: int = 5  # log a warning when a request repeats one statement this often
+
+    # auto: run DDL only when the app's schema_versions marker is stale (advisory lock)
+    # create_all: DDL on every boot | skip: never (external migrations)
+    DB_STARTUP_MODE: Literal["auto", "create_all", "skip"] = "auto"
+
+    # Optional read-only replica for GET endpoints
+    POSTGRES_REPLICA_URL: Optional[str] = None
+    READ_YOUR_WRITES_SECONDS: int = 5
+
+    ADMIN_API_KEY: Optional[str] = None  # required by /admin/* endpoints; unset disables them
+
     model_config = SettingsConfigDict(env_file=".env" if os.environ.get('ENVIRONMENT')=='Local' else None,
                                       extra="ignore")
 
@@ -1,16 +1,55 @@
 # src\core\manager_db.py
 
+import time
+from fastapi import Request
 from sqlalchemy.ext.asyncio import create_async_engine
-from sqlmodel import text, SQLModel
+from sqlmodel import text
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlalchemy.orm import sessionmaker
 from src.config import settings
+from src.core.metrics import TimedAsyncAdaptedQueuePool, instrument_engine
+from src.core.query_stats import instrument_queries
+from src.core.read_routing import reads_from_primary
+from src.core.schema import SCHEMA_VERSION, ensure_schema
 
-async_engine = create_async_engine(url=settings.POSTGRES_URL, echo=True)
+async_engine = create_async_engine(url=settings.POSTGRES_URL,
+                                   echo=settings.DB_ECHO,
+                                   pool_pre_ping=True,
+                                   poolclass=TimedAsyncAdaptedQueuePool,
+                                   pool_size=settings.DB_POOL_SIZE,
+                                   max_overflow=settings.DB_MAX_OVERFLOW,
+                                   pool_timeout=settings.DB_POOL_TIMEOUT,
+                                   pool_recycle=settings.DB_POOL_RECYCLE)
+
+instrument_engine(async_engine, "async")
+instrument_queries(async_engine)
+
+async_session = sessionmaker(
+    bind=async_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+# Optional read-only replica (POSTGRES_REPLICA_URL)
+replica_engine = None
+replica_session = None
+if settings.POSTGRES_REPLICA_URL:
+    replica_engine = create_async_engine(url=settings.POSTGRES_REPLICA_URL,
+                                         echo=settings.DB_ECHO,
+                                         pool_pre_ping=True,
+                                         poolclass=TimedAsyncAdaptedQueuePool,
+                                         pool_size=settings.DB_POOL_SIZE,
+                                         max_overflow=settings.DB_MAX_OVERFLOW,
+                                         pool_timeout=settings.DB_POOL_TIMEOUT,
+                                         pool_recycle=settings.DB_POOL_RECYCLE)
+    instrument_engine(replica_engine, "async_replica")
+    instrument_queries(replica_engine)
+    replica_session = sessionmaker(
+        bind=replica_engine, class_=AsyncSession, expire_on_commit=False
+    )
 
 
 async def init_db():
     """Create the database tables"""
+    start = time.perf_counter()
     async with async_engine.begin() as conn:
         from src.applications.projects.models import Project
         from src.applications.models.models import Model
@@ -18,14 +57,26 @@ async def init_db():
         from src.applications.hyperparameters.models import Hyperparameter
         from src.applications.clasificationes.models import Clasificacion
 
-        await conn.run_sync(SQLModel.metadata.create_all)
+        applied = await conn.run_sync(ensure_schema)
+
+    print(f"init_db ({settings.DB_STARTUP_MODE}): "
+          f"{f'schema v{SCHEMA_VERSION} applied' if applied else 'schema current, no DDL'} "
+          f"in {(time.perf_counter() - start) * 1000:.1f} ms")
 
 
 async def get_session() -> AsyncSession: # type: ignore
     """Dependency to provide the session object"""
-    async_session = sessionmaker(
-        bind=async_engine, class_=AsyncSession, expire_on_commit=False
-    )
-
     async with async_session() as session:
         yield session
+
+
+async def get_read_session(request: Request) -> AsyncSession: # type: ignore
+    """
+    Session for read-only endpoints: uses the replica when configured, unless
+    the client has just written (read-your-writes).
+    """
+    factory = async_session
+    if replica_session is not None and not reads_from_primary(request):
+        factory = replica_session
+    async with factory() as session:
+        yield session
@@ -0,0 +1,196 @@
+# src\core\metrics.py
+
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from src.core.query_stats import route_query_stats
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Bucket bounds (seconds) for the pool checkout wait histogram.
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+class PoolMetrics:
+    """
+    Counters for one connection pool, fed by SQLAlchemy pool events and
+    `_TimedPoolMixin`. Size and checked-out connections are read from the
+    pool at export time.
+    """
+
+    def __init__(self, name: str, engine):
+        self.name = name
+        self.engine = engine
+        self._lock = threading.Lock()
+        self.wait_buckets = [0] * len(WAIT_BUCKETS)
+        self.wait_count = 0
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+        self.checkouts = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+        self.pre_ping_failures = 0
+
+    def observe_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_count += 1
+            self.wait_sum += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            for i, bound in enumerate(WAIT_BUCKETS):
+                if seconds <= bound:
+                    self.wait_buckets[i] += 1
+
+    def inc(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+# Instrumented pools by name (`pool` label in /metrics).
+pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+class _TimedPoolMixin:
+    """Times how long each checkout waits for a free pooled connection."""
+
+    _metrics: Optional[PoolMetrics] = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            if self._metrics is not None:
+                self._metrics.inc("timeouts")
+            raise
+        if self._metrics is not None:
+            self._metrics.observe_wait(time.perf_counter() - start)
+        return conn
+
+    def recreate(self):
+        # engine.dispose() replaces the pool: keep the metrics.
+        pool = super().recreate()
+        pool._metrics = self._metrics
+        return pool
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine, name: str) -> PoolMetrics:
+    """
+    Register pool event hooks on `engine` (sync or `AsyncEngine`).
+    Checkout wait is only timed when the engine is created with
+    `poolclass=TimedQueuePool` / `TimedAsyncAdaptedQueuePool`.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    metrics = PoolMetrics(name, sync_engine)
+    sync_engine.pool._metrics = metrics
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.inc("checkouts")
+        if sync_engine.pool.overflow() > 0:
+            metrics.inc("overflow_checkouts")
+
+    @event.listens_for(sync_engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics.inc("invalidations")
+
+    @event.listens_for(sync_engine, "soft_invalidate")
+    def _on_soft_invalidate(dbapi_connection, connection_record, exception):
+        metrics.inc("soft_invalidations")
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(context):
+        if context.is_pre_ping:
+            metrics.inc("pre_ping_failures")
+
+    pool_metrics[name] = metrics
+    return metrics
+
+
+def _family(lines: List[str], name: str, kind: str, help_: str) -> None:
+    lines.append(f"# HELP {name} {help_}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _labels(**labels: Any) -> str:
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+
+
+def _render_pools(lines: List[str]) -> None:
+    pools = list(pool_metrics.values())
+    if not pools:
+        return
+
+    gauges = (
+        ("db_pool_size", "Persistent connections configured in the pool.", lambda m: m.engine.pool.size()),
+        ("db_pool_checked_out", "Connections currently checked out.", lambda m: m.engine.pool.checkedout()),
+        ("db_pool_checked_in", "Idle connections in the pool.", lambda m: m.engine.pool.checkedin()),
+        ("db_pool_overflow", "Overflow connections currently open.", lambda m: max(0, m.engine.pool.overflow())),
+        ("db_pool_checkout_wait_max_seconds", "Longest observed checkout wait.", lambda m: m.wait_max),
+    )
+    for name, help_, value in gauges:
+        _family(lines, name, "gauge", help_)
+        for m in pools:
+            lines.append(f"{name}{_labels(pool=m.name)} {value(m)}")
+
+    counters = (
+        ("db_pool_checkouts_total", "Connections checked out from the pool.", "checkouts"),
+        ("db_pool_overflow_checkouts_total", "Checkouts served while the pool was in overflow.", "overflow_checkouts"),
+        ("db_pool_checkout_timeouts_total", "Checkouts that hit pool_timeout.", "timeouts"),
+        ("db_pool_invalidations_total", "Invalidated connections.", "invalidations"),
+        ("db_pool_soft_invalidations_total", "Connections soft-invalidated for recycling.", "soft_invalidations"),
+        ("db_pool_pre_ping_failures_total", "pool_pre_ping failures.", "pre_ping_failures"),
+    )
+    for name, help_, attr in counters:
+        _family(lines, name, "counter", help_)
+        for m in pools:
+            lines.append(f"{name}{_labels(pool=m.name)} {getattr(m, attr)}")
+
+    name = "db_pool_checkout_wait_seconds"
+    _family(lines, name, "histogram", "Wait for a pooled connection.")
+    for m in pools:
+        with m._lock:
+            buckets, count, total = list(m.wait_buckets), m.wait_count, m.wait_sum
+        for bound, hits in zip(WAIT_BUCKETS, buckets):
+            lines.append(f"{name}_bucket{_labels(pool=m.name, le=bound)} {hits}")
+        lines.append(f'{name}_bucket{_labels(pool=m.name, le="+Inf")} {count}')
+        lines.append(f"{name}_sum{_labels(pool=m.name)} {total}")
+        lines.append(f"{name}_count{_labels(pool=m.name)} {count}")
+
+
+def _render_routes(lines: List[str]) -> None:
+    routes = route_query_stats.snapshot()
+    if not routes:
+        return
+    for i, (name, help_) in enumerate((
+        ("http_requests_total", "Requests served per route."),
+        ("http_request_db_queries_total", "SQL statements run per route."),
+        ("http_request_db_seconds_total", "Time spent in the DB per route."),
+        ("http_requests_over_query_budget_total", "Requests that exceeded their query budget."),
+    )):
+        _family(lines, name, "counter", help_)
+        for route, totals in routes.items():
+            lines.append(f"{name}{_labels(route=route)} {totals[i]}")
+
+
+def render_metrics() -> str:
+    """Process metrics in the Prometheus text format."""
+    lines: List[str] = []
+    _render_pools(lines)
+    _render_routes(lines)
+    return "\n".join(lines) + "\n"
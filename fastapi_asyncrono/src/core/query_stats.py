@@ -0,0 +1,288 @@
+# src\core\query_stats.py
+
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+
+from src.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+# Bucket bounds (ms) for the per-statement latency histogram.
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+OTHER_FINGERPRINT = "<other statements>"
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<!:):\w+|\?")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_VALUES_LIST = re.compile(r"\bVALUES\s*\(.*?\)(?:\s*,\s*\(.*?\))*", re.IGNORECASE | re.DOTALL)
+_SPACES = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """
+    Normalise a SQL statement: literals and parameters become `?`, `IN (...)` /
+    `VALUES (...)` lists of any length collapse to one form and whitespace
+    is squeezed.
+    """
+    fp = _STRING.sub("?", statement)
+    fp = _PARAM.sub("?", fp)
+    fp = _NUMBER.sub("?", fp)
+    fp = _IN_LIST.sub("IN (...)", fp)
+    fp = _VALUES_LIST.sub("VALUES (...)", fp)
+    return _SPACES.sub(" ", fp).strip()
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """Replace parameter values with their type so they can be logged."""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            return f"<{len(parameters)} rows>"
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+class _StatementStats:
+    __slots__ = ("count", "total_ms", "max_ms", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+
+class QueryStats:
+    """Accumulated latency per statement fingerprint, each with its own histogram."""
+
+    def __init__(self, max_fingerprints: int):
+        self.max_fingerprints = max_fingerprints
+        self._stats: Dict[str, _StatementStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, fp: str, elapsed_ms: float) -> None:
+        with self._lock:
+            stats = self._stats.get(fp)
+            if stats is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    fp = OTHER_FINGERPRINT
+                stats = self._stats.setdefault(fp, _StatementStats())
+            stats.count += 1
+            stats.total_ms += elapsed_ms
+            stats.max_ms = max(stats.max_ms, elapsed_ms)
+            for i, bound in enumerate(LATENCY_BUCKETS_MS):
+                if elapsed_ms <= bound:
+                    stats.buckets[i] += 1
+                    break
+            else:
+                stats.buckets[-1] += 1
+
+    @staticmethod
+    def _percentile(buckets: List[int], count: int, q: float) -> Optional[float]:
+        # Upper bound of the bucket holding percentile `q`.
+        target = q * count
+        seen = 0
+        for bound, hits in zip(LATENCY_BUCKETS_MS, buckets):
+            seen += hits
+            if seen >= target:
+                return bound
+        return None  # above the last bound
+
+    def top(self, n: int = 20) -> List[Dict[str, Any]]:
+        """The `n` statements with the most accumulated time."""
+        with self._lock:
+            items = [
+                (fp, s.count, s.total_ms, s.max_ms, list(s.buckets))
+                for fp, s in self._stats.items()
+            ]
+        items.sort(key=lambda item: item[2], reverse=True)
+
+        result = []
+        for fp, count, total_ms, max_ms, buckets in items[:n]:
+            result.append({
+                "statement": fp,
+                "count": count,
+                "total_ms": round(total_ms, 3),
+                "avg_ms": round(total_ms / count, 3),
+                "max_ms": round(max_ms, 3),
+                "p50_ms": self._percentile(buckets, count, 0.50),
+                "p95_ms": self._percentile(buckets, count, 0.95),
+                "p99_ms": self._percentile(buckets, count, 0.99),
+                "histogram": {
+                    **{f"le_{bound}": hits for bound, hits in zip(LATENCY_BUCKETS_MS, buckets)},
+                    "gt_max": buckets[-1],
+                },
+            })
+        return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+
+query_stats = QueryStats(max_fingerprints=settings.QUERY_STATS_MAX_FINGERPRINTS)
+
+
+class RequestQueries:
+    """Statements run while serving one HTTP request."""
+
+    def __init__(self, budget: int):
+        self.budget = budget
+        self.count = 0
+        self.db_ms = 0.0
+        self.fingerprints: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, fp: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.db_ms += elapsed_ms
+            self.fingerprints[fp] += 1
+
+
+_current_request_queries: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+def query_budget(max_queries: int):
+    """
+    Dependency that sets the query budget of a router or endpoint.
+    Example:   dependencies=[Depends(query_budget(5))]
+    """
+    async def _dep():
+        queries = _current_request_queries.get()
+        if queries is not None:
+            queries.budget = max_queries
+
+    return _dep
+
+
+class RouteQueryStats:
+    """Per-route query totals, exported on /metrics."""
+
+    def __init__(self):
+        self._routes: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, queries: RequestQueries) -> None:
+        with self._lock:
+            totals = self._routes.setdefault(route, [0, 0, 0.0, 0])
+            totals[0] += 1
+            totals[1] += queries.count
+            totals[2] += queries.db_ms / 1000
+            totals[3] += queries.count > queries.budget
+
+    def snapshot(self) -> Dict[str, List[float]]:
+        """`route -> [requests, queries, DB seconds, requests over budget]`"""
+        with self._lock:
+            return {route: list(totals) for route, totals in self._routes.items()}
+
+
+route_query_stats = RouteQueryStats()
+
+
+class QueryCounterMiddleware:
+    """
+    ASGI middleware counting SQL statements and DB time per request. Both are
+    published in the `Server-Timing` header and on /metrics, and a warning is
+    logged when a route exceeds its budget (`QUERY_BUDGET_PER_REQUEST` or
+    `query_budget`) or repeats the same statement (possible N+1).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries(settings.QUERY_BUDGET_PER_REQUEST)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                timing = f'db;dur={queries.db_ms:.1f};desc="{queries.count} queries"'
+                message = dict(message)
+                message["headers"] = list(message.get("headers") or []) + [
+                    (b"server-timing", timing.encode("latin-1")),
+                ]
+            await send(message)
+
+        token = _current_request_queries.set(queries)
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_request_queries.reset(token)
+            self._report(scope, queries)
+
+    @staticmethod
+    def _report(scope, queries: RequestQueries) -> None:
+        route = scope.get("route")
+        route_path = getattr(route, "path", None) or "<no route>"
+        route_query_stats.record(route_path, queries)
+
+        if queries.count > queries.budget:
+            logger.warning(
+                "Query budget exceeded on %s %s: %d queries (limit %d), %.1f ms in DB",
+                scope["method"], route_path, queries.count, queries.budget, queries.db_ms,
+            )
+        if queries.fingerprints:
+            fp, repeated = queries.fingerprints.most_common(1)[0]
+            if repeated >= settings.N_PLUS_ONE_THRESHOLD:
+                logger.warning(
+                    "Possible N+1 on %s %s: %d executions of %s",
+                    scope["method"], route_path, repeated, fp,
+                )
+
+
+def instrument_queries(engine) -> None:
+    """
+    Time every statement on `engine` (sync or `AsyncEngine`), aggregate it by
+    fingerprint in `query_stats` and log the ones slower than `SLOW_QUERY_MS`.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("query_start")
+        if not starts:
+            return
+        elapsed_ms = (time.perf_counter() - starts.pop()) * 1000
+        # Internal statements tagged `execution_options(query_stats=False)`
+        # (e.g. a per-transaction SET) are not counted.
+        if context is not None and not context.execution_options.get("query_stats", True):
+            return
+        fp = fingerprint(statement)
+        query_stats.record(fp, elapsed_ms)
+        request_queries = _current_request_queries.get()
+        if request_queries is not None:
+            request_queries.record(fp, elapsed_ms)
+
+        if elapsed_ms >= settings.SLOW_QUERY_MS:
+            logger.warning(
+                "Slow query (%.1f ms): %s | parameters: %s",
+                elapsed_ms, fp, redact_parameters(parameters),
+            )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(context):
+        # The statement failed: drop its start mark.
+        starts = context.connection.info.get("query_start") if context.connection is not None else None
+        if starts:
+            starts.pop()
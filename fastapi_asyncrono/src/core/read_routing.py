@@ -0,0 +1,40 @@
+# src\core\read_routing.py
+
+from fastapi import Request
+
+from src.config import settings
+
+
+# Cookie/header that forces reads against the primary (read-your-writes).
+READ_PRIMARY_MARKER = "X-Read-Primary"
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def reads_from_primary(request: Request) -> bool:
+    """
+    True when the request must read from the primary: the client has just
+    written (cookie set by `read_your_writes_middleware`) or asks for it.
+    """
+    return (
+        READ_PRIMARY_MARKER in request.cookies
+        or request.headers.get(READ_PRIMARY_MARKER) == "1"
+    )
+
+
+async def read_your_writes_middleware(request: Request, call_next):
+    """
+    After a successful write, mark the client for `READ_YOUR_WRITES_SECONDS`
+    so its next reads do not hit a lagging replica.
+    """
+    response = await call_next(request)
+    if request.method not in SAFE_METHODS and response.status_code < 400:
+        response.set_cookie(
+            key=READ_PRIMARY_MARKER,
+            value="1",
+            max_age=settings.READ_YOUR_WRITES_SECONDS,
+            httponly=True,
+            samesite="lax",
+            path="/"
+        )
+    return response
@@ -0,0 +1,67 @@
+# src\core\schema.py
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlmodel import SQLModel
+
+from src.config import settings
+
+
+# Bump when tables/indexes are added or changed so the next boot runs the DDL.
+SCHEMA_VERSION = 1
+
+# `pg_advisory_xact_lock` key that serialises DDL across workers and instances.
+SCHEMA_LOCK_KEY = 7_401_202
+
+# Own row in `schema_versions`: each app sharing the database keeps its own marker.
+SCHEMA_APP = "fastapi_asyncrono"
+
+
+def _schema_is_current(conn: Connection) -> bool:
+    if conn.execute(text("SELECT to_regclass('schema_versions')")).scalar() is None:
+        return False
+    version = conn.execute(
+        text("SELECT version FROM schema_versions WHERE app = :app"), {"app": SCHEMA_APP}
+    ).scalar()
+    # A newer marker (rolling deploy) also counts: older code never downgrades it.
+    return version is not None and version >= SCHEMA_VERSION
+
+
+def ensure_schema(conn: Connection) -> bool:
+    """
+    Create the tables according to `DB_STARTUP_MODE`; returns True if DDL ran.
+
+    - auto: check the app's marker in `schema_versions` and only run
+      `create_all` when it is stale. DDL runs under a transaction advisory lock, so when several
+      workers boot at once one of them applies it and the rest skip it.
+    - create_all: always run `create_all` (previous behaviour).
+    - skip: leave the schema alone.
+    """
+    mode = settings.DB_STARTUP_MODE
+    if mode == "skip":
+        return False
+    if mode == "auto" and _schema_is_current(conn):
+        return False
+
+    conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY})
+    if mode == "auto" and _schema_is_current(conn):
+        # Another worker applied it while we waited for the lock.
+        return False
+
+    SQLModel.metadata.create_all(conn)
+    conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_versions ("
+        " app VARCHAR(64) PRIMARY KEY,"
+        " version INTEGER NOT NULL,"
+        " applied_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+    ))
+    conn.execute(
+        text(
+            "INSERT INTO schema_versions (app, version) VALUES (:app, :version) "
+            "ON CONFLICT (app) DO UPDATE SET"
+            " version = GREATEST(schema_versions.version, EXCLUDED.version),"
+            " applied_at = now()"
+        ),
+        {"app": SCHEMA_APP, "version": SCHEMA_VERSION},
+    )
+    return True
@@ -7,7 +7,10 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from contextlib import asynccontextmanager
+from src.config import settings
 from src.core.manager_db import init_db
+from src.core.query_stats import QueryCounterMiddleware
+from src.core.read_routing import read_your_writes_middleware
 
 def create_app() -> FastAPI:
 
@@ -24,6 +27,8 @@ def create_app() -> FastAPI:
         description="A simple web service for a email clasfication",
         lifespan=lifespan)
 
+    app.add_middleware(QueryCounterMiddleware)
+
     # Middleware CORS
     app.add_middleware(
         CORSMiddleware,
@@ -33,17 +38,22 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    if settings.POSTGRES_REPLICA_URL:
+        app.middleware("http")(read_your_writes_middleware)
+
     from src.applications.projects.routers import project_router
     from src.applications.models.routers import model_router
     from src.applications.prompts.routers import prompt_router
     from src.applications.hyperparameters.routers import hyperparameter_router
     from src.applications.clasificationes.routers import clasificacion_router
+    from src.applications.monitoring.routers import monitoring_router
 
     app.include_router(project_router)
     app.include_router(model_router)
     app.include_router(prompt_router)
     app.include_router(hyperparameter_router)
     app.include_router(clasificacion_router)
+    app.include_router(monitoring_router)
 
     return app
 